@@ -1,12 +1,22 @@
+import hashlib
+import json
 import os
 import shutil
+import zipfile
+from functools import lru_cache
+from typing import Tuple
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, BackgroundTasks, Form
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
+from app.api.uploads import MULTI_UPLOAD_OPENAPI, UPLOAD_OPENAPI, receive_upload
 from app.core.config import get_settings
 from app.core.logger import logger
+from app.core.report import collect_details, detail_headers
+from app.services.cache_service import ResultCache
 from app.services.converter_service import ConverterService
+from app.services.job_service import JobManager, JobStatus
+from app.services.workspace_service import Workspace, WorkspaceManager
 
 router = APIRouter()
 settings = get_settings()
@@ -14,26 +24,93 @@ settings = get_settings()
 # Initialize Service
 converter_service = ConverterService()
 
-# Temporary directories
-UPLOAD_DIR = "temp/uploads"
-OUTPUT_DIR = "temp/outputs"
+# Conversion result cache
+result_cache = ResultCache(settings.CACHE_DIR, settings.CACHE_MAX_BYTES) if settings.CACHE_ENABLED else None
 
-# Ensure directories exist
-os.makedirs(UPLOAD_DIR, exist_ok=True)
-os.makedirs(OUTPUT_DIR, exist_ok=True)
+# Per-request working directories (created on demand, swept when abandoned)
+workspaces = WorkspaceManager(settings.WORK_DIR, ttl=settings.WORK_DIR_TTL, max_bytes=settings.WORK_DIR_MAX_BYTES)
+
+# Asynchronous job scheduler
+job_manager = JobManager(
+    converter_service,
+    workspaces,
+    max_workers=settings.JOB_MAX_WORKERS,
+    max_queue=settings.JOB_QUEUE_SIZE,
+    result_ttl=settings.JOB_RESULT_TTL,
+)
 
 
 def remove_file(path: str):
     """
-    Helper to remove a file and log any errors.
+    Helper to remove a temporary file or directory and log any errors.
     """
     try:
-        os.remove(path)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
         logger.debug(f"Removed temporary file: {path}")
     except Exception as e:
         logger.warning(f"Failed to remove temporary file {path}: {e}")
 
 
+def require_target_format(fields: dict) -> str:
+    """
+    Helper to read the mandatory target_format form field.
+    """
+    target_format = fields.get("target_format", "").strip()
+    if not target_format:
+        raise HTTPException(status_code=422, detail="Field required: target_format")
+    return target_format
+
+
+def require_target_formats(fields: dict) -> list[str]:
+    """
+    Helper to read the mandatory target_formats form field (comma-separated, duplicates dropped).
+    """
+    target_formats = []
+    for target_format in fields.get("target_formats", "").split(","):
+        target_format = target_format.strip()
+        if target_format and target_format not in target_formats:
+            target_formats.append(target_format)
+    if not target_formats:
+        raise HTTPException(status_code=422, detail="Field required: target_formats")
+    return target_formats
+
+
+@lru_cache()
+def capabilities_document() -> Tuple[bytes, str]:
+    """
+    Helper to render the capabilities response once, with its ETag.
+    """
+    body = json.dumps(converter_service.get_supported_conversions(), separators=(",", ":")).encode("utf-8")
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def remove_workspace(workspace: Workspace):
+    """
+    Helper to remove a request's working directory (input and output files).
+    """
+    remove_file(workspace.root)
+    workspaces.release(workspace)
+
+
+def parse_options(fields: dict) -> dict:
+    """
+    Helper to read the optional `options` form field (a JSON object of plugin options).
+    """
+    raw = fields.get("options", "").strip()
+    if not raw:
+        return {}
+    try:
+        options = json.loads(raw)
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid options JSON: {e}")
+    if not isinstance(options, dict):
+        raise HTTPException(status_code=422, detail="Options must be a JSON object")
+    return options
+
+
 @router.get("/health")
 async def health_check():
     return {
@@ -44,69 +121,244 @@ async def health_check():
 
 
 @router.get("/capabilities")
-async def get_capabilities():
+async def get_capabilities(request: Request, costs: bool = False):
     """
-    Get the list of supported conversions.
+    Get the list of supported conversions, including targets reached over several steps.
+    With `costs=true`, every target comes with its estimated cost (seconds) and conversion path.
+
+    The plain list is precomputed and served with an ETag; a matching If-None-Match gets 304.
     """
-    return converter_service.get_supported_conversions()
+    if costs:
+        return converter_service.get_conversion_costs()
+
+    body, etag = capabilities_document()
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
-@router.post("/convert", response_class=FileResponse)
-async def convert_file(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    target_format: str = Form(...)
-):
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """
+    Get hit/miss counters and size of the conversion result cache.
+    """
+    if not result_cache:
+        return {"enabled": False}
+    return {"enabled": True, **result_cache.stats()}
+
+
+@router.post("/convert", response_class=FileResponse, openapi_extra=UPLOAD_OPENAPI)
+async def convert_file(request: Request, background_tasks: BackgroundTasks):
     """
     Upload a file and convert it based on its extension.
+    The multipart body is streamed straight to the input path (form fields: file, target_format).
     """
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="Filename is missing")
+    workspace = workspaces.create()
 
-    input_path = None
-    output_path = None
+    def upload_path(filename: str) -> str:
+        # Reject unsupported formats before the body is read
+        converter_service.get_converter_meta(filename)
+        return workspace.input_path(filename)
 
     try:
-        # Generate input path
-        input_path = os.path.join(UPLOAD_DIR, file.filename)
-        
-        # Determine strict absolute path to avoid traversal issues (basic check)
-        input_path = os.path.abspath(input_path)
+        # Save uploaded file, hashing and sniffing it on the way
+        fields, upload = await receive_upload(request, upload_path, settings.MAX_UPLOAD_BYTES)
+        target_format = require_target_format(fields)
+        options = parse_options(fields)
 
-        # Save uploaded file
-        with open(input_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Serve repeated conversions straight from the cache
+        cache_key = None
+        if result_cache:
+            meta = converter_service.get_converter_meta(upload.filename)
+            cache_key = result_cache.make_key(upload.content_hash, meta.name, target_format, options)
+            cached_path = result_cache.get(cache_key)
+            if cached_path:
+                logger.info(f"Cache hit for {upload.filename} -> {target_format}")
+                background_tasks.add_task(remove_workspace, workspace)
+                base_name, _ = os.path.splitext(upload.filename)
+                _, cached_ext = os.path.splitext(cached_path)
+                return FileResponse(
+                    path=cached_path,
+                    filename=f"{base_name}{cached_ext}",
+                    media_type="application/octet-stream"
+                )
 
-        # Execute conversion
-        output_path = await converter_service.execute_conversion(input_path, OUTPUT_DIR, target_format=target_format)
+        # Execute conversion, collecting how the plugin went about it
+        with collect_details() as details:
+            output_path = await converter_service.execute_conversion(
+                upload.path, workspace.output_dir, target_format=target_format,
+                options=options, content_hash=upload.content_hash
+            )
         
         # Verify output exists
         if not os.path.exists(output_path):
              raise HTTPException(status_code=500, detail="Conversion generated no output")
 
         filename = os.path.basename(output_path)
+
+        if cache_key:
+            result_cache.put(cache_key, output_path)
         
-        # Register cleanup tasks (Success Case)
-        background_tasks.add_task(remove_file, input_path)
-        background_tasks.add_task(remove_file, output_path)
+        # Register cleanup tasks (Success Case): the workspace holds input and output
+        background_tasks.add_task(remove_workspace, workspace)
 
         # Return file
         return FileResponse(
             path=output_path,
             filename=filename,
-            media_type="application/octet-stream"
+            media_type="application/octet-stream",
+            headers=detail_headers(details)
         )
 
     except Exception as e:
         # cleanup on failure
-        if input_path and os.path.exists(input_path):
-            remove_file(input_path)
-        # If output path was somehow created but we are failing, clean it too
-        if output_path and os.path.exists(output_path):
-            remove_file(output_path)
+        remove_workspace(workspace)
 
         if isinstance(e, HTTPException):
             raise e
         raise HTTPException(status_code=500, detail=f"Conversion failed: {str(e)}")
-    finally:
-        file.file.close()
+
+
+@router.post("/convert/multi", response_class=FileResponse, openapi_extra=MULTI_UPLOAD_OPENAPI)
+async def convert_file_multi(request: Request, background_tasks: BackgroundTasks):
+    """
+    Upload a file once and convert it to several formats, returned together as a ZIP archive.
+    The source is parsed once for all targets where the plugin supports it.
+    """
+    workspace = workspaces.create()
+
+    def upload_path(filename: str) -> str:
+        converter_service.get_converter_meta(filename)
+        return workspace.input_path(filename)
+
+    try:
+        fields, upload = await receive_upload(request, upload_path, settings.MAX_UPLOAD_BYTES)
+        target_formats = require_target_formats(fields)
+        options = parse_options(fields)
+
+        output_paths = await converter_service.execute_multi_conversion(
+            upload.path, workspace.output_dir, target_formats, options=options
+        )
+
+        base_name, _ = os.path.splitext(upload.filename)
+        archive_path = os.path.join(workspace.root, f"{base_name}.zip")
+        with zipfile.ZipFile(archive_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for output_path in output_paths:
+                if not os.path.exists(output_path):
+                    raise HTTPException(status_code=500, detail="Conversion generated no output")
+                archive.write(output_path, arcname=os.path.basename(output_path))
+
+        background_tasks.add_task(remove_workspace, workspace)
+
+        return FileResponse(
+            path=archive_path,
+            filename=os.path.basename(archive_path),
+            media_type="application/zip"
+        )
+
+    except Exception as e:
+        remove_workspace(workspace)
+
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=f"Conversion failed: {str(e)}")
+
+
+@router.post("/jobs", status_code=202, openapi_extra=UPLOAD_OPENAPI)
+async def submit_job(request: Request):
+    """
+    Upload a file and queue its conversion. Returns a job id immediately.
+    """
+    job = None
+
+    def upload_path(filename: str) -> str:
+        nonlocal job
+        # Reject unknown source formats up front instead of failing the job later
+        converter_service.get_converter_meta(filename)
+        job = job_manager.create_job(filename)
+        return job.input_path
+
+    try:
+        fields, upload = await receive_upload(request, upload_path, settings.MAX_UPLOAD_BYTES)
+        job.target_format = require_target_format(fields)
+        job.options = parse_options(fields)
+        job.content_hash = upload.content_hash
+        await job_manager.enqueue(job)
+    except Exception as e:
+        if job:
+            job_manager.discard(job.id)
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=500, detail=f"Job submission failed: {str(e)}")
+
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": f"{settings.API_V1_STR}/jobs/{job.id}",
+        "result_url": f"{settings.API_V1_STR}/jobs/{job.id}/result",
+    }
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status of a conversion job.
+    """
+    return job_manager.get(job_id).public_dict()
+
+
+@router.get("/jobs/{job_id}/progress")
+async def get_job_progress(job_id: str):
+    """
+    Get the progress of a conversion job (percent, speed, ETA where the plugin reports them).
+    """
+    job = job_manager.get(job_id)
+    return {"job_id": job.id, "job_status": job.status, **job_manager.get_progress(job_id).progress.model_dump()}
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_progress(job_id: str, request: Request):
+    """
+    Stream the progress of a conversion job as Server-Sent Events.
+    Sends a `progress` event on every update and an `end` event once the job has finished.
+    """
+    job = job_manager.get(job_id)
+    tracker = job_manager.get_progress(job_id)
+
+    async def events():
+        version = -1
+        while not await request.is_disconnected():
+            if version != tracker.version:
+                version = tracker.version
+                data = json.dumps({"job_status": job.status, **tracker.progress.model_dump()})
+                yield f"event: progress\ndata: {data}\n\n"
+            if job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED) and version == tracker.version:
+                yield f"event: end\ndata: {json.dumps({'job_status': job.status})}\n\n"
+                return
+            if not await tracker.wait_for_change(version, settings.JOB_EVENTS_HEARTBEAT):
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/jobs/{job_id}/result", response_class=FileResponse)
+async def get_job_result(job_id: str):
+    """
+    Download the output of a finished conversion job.
+    """
+    job = job_manager.get(job_id)
+
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != JobStatus.SUCCEEDED:
+        raise HTTPException(status_code=409, detail=f"Job is not finished (status: {job.status.value})")
+    if not job.output_path or not os.path.exists(job.output_path):
+        raise HTTPException(status_code=410, detail="Job result is no longer available")
+
+    return FileResponse(
+        path=job.output_path,
+        filename=os.path.basename(job.output_path),
+        media_type="application/octet-stream",
+        headers=detail_headers(job.details)
+    )
@@ -0,0 +1,287 @@
+import hashlib
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiofiles
+from fastapi import HTTPException, Request
+from loguru import logger
+from multipart.multipart import MultipartParser, parse_options_header
+from pydantic import BaseModel
+
+# Leading bytes kept for content sniffing
+SNIFF_BYTES = 16
+# Plain form fields are small (target format, options)
+MAX_FIELD_BYTES = 64 * 1024
+
+# Known signatures and the extensions they may legitimately carry
+MAGIC_SIGNATURES: List[Tuple[int, bytes, str]] = [
+    (0, b"%PDF-", "pdf"),
+    (0, b"\x89PNG\r\n\x1a\n", "png"),
+    (0, b"\xff\xd8\xff", "jpeg"),
+    (8, b"WEBP", "webp"),
+    (8, b"AVI ", "avi"),
+    (0, b"PK\x03\x04", "zip"),
+    (4, b"ftyp", "mp4"),
+    (0, b"\x1a\x45\xdf\xa3", "matroska"),
+]
+
+COMPATIBLE_EXTENSIONS: Dict[str, set] = {
+    "pdf": {".pdf"},
+    "png": {".png"},
+    "jpeg": {".jpg", ".jpeg"},
+    "webp": {".webp"},
+    "avi": {".avi"},
+    "zip": {".docx", ".pptx", ".xlsx", ".odt", ".odp", ".ods", ".zip"},
+    "mp4": {".mp4", ".mov", ".m4v", ".m4a"},
+    "matroska": {".mkv", ".webm"},
+}
+
+
+def upload_openapi(target_field: str, target_description: str) -> dict:
+    """
+    Describe a multipart upload body for the OpenAPI docs, since it is parsed manually.
+    """
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "required": ["file", target_field],
+                        "properties": {
+                            "file": {"type": "string", "format": "binary"},
+                            target_field: {"type": "string", "description": target_description},
+                            "options": {
+                                "type": "string",
+                                "description": 'JSON object of plugin options, e.g. {"pages": "1-5", "dpi": 150}',
+                            },
+                        },
+                    }
+                }
+            },
+        }
+    }
+
+
+UPLOAD_OPENAPI = upload_openapi("target_format", "Target extension, e.g. .pdf")
+MULTI_UPLOAD_OPENAPI = upload_openapi("target_formats", 'Comma-separated target extensions, e.g. ".docx,.txt,.png"')
+
+
+def sniff_type(head: bytes) -> Optional[str]:
+    """
+    Identify a file type from its leading bytes.
+
+    Returns:
+        str, optional: The detected type name, or None if no signature matched.
+    """
+    for offset, signature, kind in MAGIC_SIGNATURES:
+        if head[offset:offset + len(signature)] == signature:
+            return kind
+    return None
+
+
+class ReceivedUpload(BaseModel):
+    """
+    A file streamed from a multipart request body to disk.
+
+    Attributes:
+        filename (str): Client-supplied file name (base name only).
+        path (str): Where the bytes were written.
+        size (int): Number of bytes written.
+        content_hash (str): SHA-256 hex digest of the content.
+        detected_type (str, optional): Type identified from the magic bytes.
+    """
+    filename: str
+    path: str
+    size: int
+    content_hash: str
+    detected_type: Optional[str] = None
+
+
+class StreamingUploadParser:
+    """
+    Parse a multipart/form-data body and write its file part straight to its
+    final location as the chunks arrive.
+
+    Unlike FastAPI's `UploadFile`, the file is not spooled to a temporary file
+    first, so every byte is written to disk once. The size limit, content hash
+    and magic-byte sniffing are all applied on the fly.
+    """
+
+    def __init__(self, request: Request, path_for: Callable[[str], str], max_bytes: int, file_field: str = "file"):
+        """
+        Args:
+            request (Request): The incoming request.
+            path_for (Callable): Maps the client file name to the destination path.
+                May raise HTTPException to reject the upload before its body is read.
+            max_bytes (int): Maximum accepted file size.
+            file_field (str): Name of the form field carrying the file.
+        """
+        self._request = request
+        self._path_for = path_for
+        self._max_bytes = max_bytes
+        self._file_field = file_field
+
+        self.fields: Dict[str, str] = {}
+        self.upload: Optional[ReceivedUpload] = None
+
+        self._events: List[Tuple[str, bytes]] = []
+        self._header_field = b""
+        self._header_value = b""
+        self._disposition = b""
+        self._part_name: Optional[str] = None
+        self._field_data = b""
+        self._file = None
+        self._digest = None
+        self._head = b""
+
+    # Parser callbacks only record events; file IO happens in `parse` where it can be awaited
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        self._events.append(("part_data", data[start:end]))
+
+    def _on_part_end(self):
+        self._events.append(("part_end", b""))
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_field.lower() == b"content-disposition":
+            self._disposition = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        self._events.append(("headers_finished", self._disposition))
+        self._disposition = b""
+
+    async def parse(self) -> Tuple[Dict[str, str], ReceivedUpload]:
+        """
+        Consume the request body.
+
+        Returns:
+            Tuple[Dict[str, str], ReceivedUpload]: The plain form fields and the received file.
+
+        Raises:
+            HTTPException: 413 if the file exceeds the size limit, 422 for malformed or
+                incomplete forms, 400 if the content does not match the file extension.
+        """
+        content_type, params = parse_options_header(self._request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in params:
+            raise HTTPException(status_code=422, detail="Expected a multipart/form-data body")
+
+        content_length = self._request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self._max_bytes + 64 * 1024:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds the {self._max_bytes} byte limit")
+
+        parser = MultipartParser(params[b"boundary"], {
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+        try:
+            async for chunk in self._request.stream():
+                parser.write(chunk)
+                await self._process_events()
+            parser.finalize()
+            await self._process_events()
+        except Exception:
+            await self._discard_file()
+            raise
+
+        if self.upload is None:
+            raise HTTPException(status_code=422, detail=f"Missing file field: {self._file_field}")
+        return self.fields, self.upload
+
+    async def _process_events(self):
+        events, self._events = self._events, []
+        for kind, data in events:
+            if kind == "headers_finished":
+                self._part_name = await self._begin_part(data)
+                self._field_data = b""
+            elif kind == "part_data":
+                if self._file is not None:
+                    await self._write_file_chunk(data)
+                else:
+                    self._field_data += data
+                    if len(self._field_data) > MAX_FIELD_BYTES:
+                        raise HTTPException(status_code=422, detail=f"Form field {self._part_name} is too large")
+            elif kind == "part_end":
+                if self._file is not None:
+                    await self._finish_file()
+                elif self._part_name is not None:
+                    self.fields[self._part_name] = self._field_data.decode("utf-8", errors="replace")
+                self._part_name = None
+                self._field_data = b""
+
+    async def _begin_part(self, disposition: bytes) -> Optional[str]:
+        _, options = parse_options_header(disposition)
+        name = options.get(b"name", b"").decode("utf-8", errors="replace")
+        if b"filename" not in options:
+            return name
+
+        if name != self._file_field or self.upload is not None or self._file is not None:
+            raise HTTPException(status_code=422, detail="Exactly one file is accepted")
+
+        filename = os.path.basename(options[b"filename"].decode("utf-8", errors="replace")).strip()
+        if not filename:
+            raise HTTPException(status_code=422, detail="Filename is missing")
+
+        path = self._path_for(filename)
+        self._file = await aiofiles.open(path, mode="wb")
+        self._digest = hashlib.sha256()
+        self._head = b""
+        self.upload = ReceivedUpload(filename=filename, path=path, size=0, content_hash="")
+        return name
+
+    async def _write_file_chunk(self, data: bytes):
+        self.upload.size += len(data)
+        if self.upload.size > self._max_bytes:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds the {self._max_bytes} byte limit")
+
+        if len(self._head) < SNIFF_BYTES:
+            self._head += data[:SNIFF_BYTES - len(self._head)]
+        self._digest.update(data)
+        await self._file.write(data)
+
+    async def _finish_file(self):
+        await self._file.close()
+        self._file = None
+        self.upload.content_hash = self._digest.hexdigest()
+        self.upload.detected_type = sniff_type(self._head)
+
+        ext = os.path.splitext(self.upload.filename)[1].lower()
+        allowed = COMPATIBLE_EXTENSIONS.get(self.upload.detected_type)
+        if allowed is not None and ext not in allowed:
+            raise HTTPException(
+                status_code=400,
+                detail=f"File content ({self.upload.detected_type}) does not match its extension {ext}"
+            )
+
+    async def _discard_file(self):
+        """
+        Remove a partially written or rejected file.
+        """
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
+        if self.upload and os.path.exists(self.upload.path):
+            os.remove(self.upload.path)
+            logger.debug(f"Discarded upload {self.upload.path}")
+
+
+async def receive_upload(
+    request: Request, path_for: Callable[[str], str], max_bytes: int
+) -> Tuple[Dict[str, str], ReceivedUpload]:
+    """
+    Stream a multipart upload to disk. See `StreamingUploadParser`.
+    """
+    return await StreamingUploadParser(request, path_for, max_bytes).parse()
@@ -1,5 +1,5 @@
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,6 +10,115 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     BACKEND_CORS_ORIGINS: List[str] = []
 
+    # Per-request working directories
+    WORK_DIR: str = "temp/work"
+    # Abandoned workspaces older than this (seconds) are swept; keep above JOB_RESULT_TTL
+    WORK_DIR_TTL: int = 7200
+    # Disk budget for all workspaces; the oldest unused ones are swept beyond it
+    WORK_DIR_MAX_BYTES: int = 20 * 1024 * 1024 * 1024
+    WORK_SWEEP_INTERVAL: int = 300
+
+    # Largest accepted upload, enforced while the body streams in
+    MAX_UPLOAD_BYTES: int = 2 * 1024 * 1024 * 1024
+
+    # Per-plugin admission control, keyed by plugin name
+    PLUGIN_CONCURRENCY: Dict[str, int] = {
+        "video-converter": 2,
+        "office-converter": 2,
+        "pdf-converter": 4,
+    }
+    # Requests allowed to wait for a slot before new ones get 429 + Retry-After
+    PLUGIN_QUEUE_LIMITS: Dict[str, int] = {
+        "video-converter": 4,
+        "office-converter": 8,
+    }
+    DEFAULT_PLUGIN_CONCURRENCY: int = 8
+    DEFAULT_PLUGIN_QUEUE_LIMIT: int = 16
+
+    # Plugins are imported on first use; these (plugin names or source extensions, "*" for all)
+    # are imported at startup instead
+    PLUGIN_PREWARM: List[str] = []
+
+    # Longest chain of plugin conversions used to reach a target without a direct plugin
+    CONVERSION_MAX_HOPS: int = 3
+
+    # Executor pools for blocking plugin work
+    # "thread" or "process"; process mode requires picklable plugin instances
+    EXECUTOR_CPU_MODE: str = "thread"
+    # Defaults to os.cpu_count() when unset
+    EXECUTOR_CPU_WORKERS: Optional[int] = None
+    EXECUTOR_IO_WORKERS: int = 8
+    # Worker processes for plugins splitting one conversion across cores, defaults to os.cpu_count()
+    EXECUTOR_PROCESS_WORKERS: Optional[int] = None
+
+    # PDF text extraction: documents with at least this many pages are split into
+    # shards of PDF_SHARD_PAGES pages and extracted in parallel worker processes
+    PDF_PARALLEL_MIN_PAGES: int = 64
+    PDF_SHARD_PAGES: int = 32
+    # PDF rendering: pages per worker task, and tasks in flight (= pixmaps alive at once)
+    PDF_RENDER_BATCH_PAGES: int = 4
+    PDF_RENDER_MAX_INFLIGHT: int = 4
+    PDF_MAX_DPI: int = 600
+    # PDF to DOCX: documents with at least PDF_DOCX_PARALLEL_MIN_PAGES pages are laid out
+    # in page segments by PDF_DOCX_WORKERS processes (defaults to os.cpu_count()).
+    # A conversion still running after PDF_DOCX_TIMEOUT seconds is killed.
+    PDF_DOCX_WORKERS: Optional[int] = None
+    PDF_DOCX_PARALLEL_MIN_PAGES: int = 16
+    PDF_DOCX_TIMEOUT: int = 600
+
+    # FFmpeg binaries; only the last FFMPEG_STDERR_LINES lines of ffmpeg's stderr are kept
+    FFMPEG_BINARY: str = "ffmpeg"
+    FFPROBE_BINARY: str = "ffprobe"
+    FFMPEG_STDERR_LINES: int = 100
+    # Video transcodes to MKV/AVI of inputs at least VIDEO_SEGMENT_MIN_DURATION seconds long
+    # are cut at keyframes into VIDEO_SEGMENT_WORKERS segments (defaults to os.cpu_count()),
+    # transcoded by parallel ffmpeg processes and joined without re-encoding. Off when unset.
+    VIDEO_SEGMENT_MIN_DURATION: Optional[float] = None
+    VIDEO_SEGMENT_WORKERS: Optional[int] = None
+
+    # Wall-clock timeouts (seconds) of conversion subprocesses. A process still running
+    # after its timeout, or when its request is cancelled, is killed with its children.
+    FFMPEG_TIMEOUT: float = 3600
+    FFPROBE_TIMEOUT: float = 30
+    # Per document; batched soffice runs get one timeout per document in the batch
+    SOFFICE_TIMEOUT: float = 300
+    # Optional rlimits of conversion subprocesses, unset means unlimited
+    SUBPROCESS_MAX_CPU_SECONDS: Optional[int] = None
+    SUBPROCESS_MAX_MEMORY_BYTES: Optional[int] = None
+    SUBPROCESS_MAX_FILE_BYTES: Optional[int] = None
+
+    # Asynchronous job scheduler
+    JOB_MAX_WORKERS: int = 2
+    JOB_QUEUE_SIZE: int = 100
+    # Seconds a finished job's result is kept for download
+    JOB_RESULT_TTL: int = 3600
+    # Seconds between keep-alive comments on idle job event streams
+    JOB_EVENTS_HEARTBEAT: int = 15
+
+    # Conversion result cache
+    CACHE_ENABLED: bool = True
+    CACHE_DIR: str = "temp/cache"
+    CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+
+    # LibreOffice
+    SOFFICE_BINARY: str = "soffice"
+    # Warm instance pool with isolated profiles; resident listeners need python3-uno
+    OFFICE_POOL_ENABLED: bool = True
+    OFFICE_POOL_SIZE: int = 2
+    OFFICE_POOL_BASE_PORT: int = 2002
+    OFFICE_POOL_PROFILE_DIR: str = "temp/office_profiles"
+    # Recycle an instance after this many conversions
+    OFFICE_POOL_MAX_JOBS: int = 200
+    OFFICE_POOL_START_TIMEOUT: float = 30
+    # Seconds between idle health checks, 0 disables
+    OFFICE_POOL_HEALTH_INTERVAL: float = 30
+    OFFICE_POOL_WARM_ON_STARTUP: bool = False
+    # Group documents arriving within the window into one soffice invocation
+    # (not used with resident instances, which have no per-run startup cost)
+    OFFICE_BATCH_ENABLED: bool = True
+    OFFICE_BATCH_WINDOW_MS: int = 100
+    OFFICE_BATCH_MAX_SIZE: int = 8
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
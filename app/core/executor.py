@@ -0,0 +1,129 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+from app.core.config import get_settings
+
+
+class Workload(str, Enum):
+    """
+    The kind of resource a converter plugin mostly consumes.
+
+    Attributes:
+        CPU: Pure computation in Python or native libraries (PDF parsing, image codecs).
+        IO: Blocking file or network IO.
+        SUBPROCESS: Work delegated to an external program (soffice, ffmpeg).
+    """
+    CPU = "cpu"
+    IO = "io"
+    SUBPROCESS = "subprocess"
+
+
+class ExecutorPool:
+    """
+    Managed executor pools used to run blocking plugin work off the event loop.
+
+    CPU-bound work runs in a dedicated pool (threads or processes, depending on
+    configuration) and blocking IO runs in a separate thread pool, so a burst of
+    heavy conversions cannot exhaust the threads used for cheap file operations.
+    Subprocess-based plugins already await their child processes and are run
+    directly on the event loop.
+    """
+
+    def __init__(
+        self,
+        cpu_mode: str = "thread",
+        cpu_workers: Optional[int] = None,
+        io_workers: int = 8,
+        process_workers: Optional[int] = None,
+    ):
+        if cpu_mode not in ("thread", "process"):
+            raise ValueError(f"Unknown executor mode: {cpu_mode}")
+        self.cpu_mode = cpu_mode
+        self.cpu_workers = cpu_workers or os.cpu_count() or 1
+        self.io_workers = io_workers
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self._executors: Dict[Workload, Executor] = {}
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self, workload: Workload) -> Executor:
+        """
+        Lazily create the executor serving the given workload type.
+        """
+        if workload == Workload.SUBPROCESS:
+            # Child processes do the real work; only the bookkeeping needs a thread
+            workload = Workload.IO
+
+        executor = self._executors.get(workload)
+        if executor is None:
+            if workload == Workload.CPU and self.cpu_mode == "process":
+                executor = ProcessPoolExecutor(max_workers=self.cpu_workers)
+            elif workload == Workload.CPU:
+                executor = ThreadPoolExecutor(max_workers=self.cpu_workers, thread_name_prefix="convert-cpu")
+            else:
+                executor = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="convert-io")
+            self._executors[workload] = executor
+            logger.info(f"Started {workload.value} executor ({type(executor).__name__})")
+        return executor
+
+    async def run(self, workload: Workload, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a synchronous callable in the pool matching its workload and await the result.
+
+        Args:
+            workload (Workload): The kind of work the callable performs.
+            func (Callable): The blocking callable. Must be picklable in process mode.
+            *args, **kwargs: Arguments forwarded to the callable.
+
+        Returns:
+            Any: The callable's return value.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor(workload)
+        return await loop.run_in_executor(executor, functools.partial(func, *args, **kwargs))
+
+    def process_pool(self) -> Optional[ProcessPoolExecutor]:
+        """
+        Process pool for plugins that fan a single conversion out over several
+        cores (e.g. page shards). Used synchronously from inside `convert_sync`.
+
+        Returns:
+            ProcessPoolExecutor, optional: None when parallelism is unavailable,
+                i.e. a single worker is configured or the caller already runs
+                inside a worker process (nested pools are not supported).
+        """
+        if self.process_workers <= 1 or multiprocessing.parent_process() is not None:
+            return None
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+            logger.info(f"Started process pool with {self.process_workers} workers")
+        return self._process_pool
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shut down all started executors.
+        """
+        for executor in self._executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+        self._executors.clear()
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait, cancel_futures=True)
+            self._process_pool = None
+
+
+@lru_cache
+def get_executor_pool() -> ExecutorPool:
+    settings = get_settings()
+    return ExecutorPool(
+        cpu_mode=settings.EXECUTOR_CPU_MODE,
+        cpu_workers=settings.EXECUTOR_CPU_WORKERS,
+        io_workers=settings.EXECUTOR_IO_WORKERS,
+        process_workers=settings.EXECUTOR_PROCESS_WORKERS,
+    )
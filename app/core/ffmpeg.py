@@ -0,0 +1,194 @@
+import asyncio
+import json
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.subprocess_runner import ProcessTimeoutError, ResourceLimits, managed_process, run_process
+
+# Arguments making ffmpeg write key=value progress blocks to stdout instead of stats to stderr
+PROGRESS_ARGS = ["-progress", "pipe:1", "-nostats"]
+
+
+class StderrTail:
+    """
+    Keep only the last lines of a process's stderr, however much it writes.
+    """
+
+    def __init__(self, max_lines: int = 100):
+        self.lines = deque(maxlen=max_lines)
+
+    async def consume(self, stream: asyncio.StreamReader):
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # Line over the stream limit; the reader has already dropped it
+                self.lines.append("[line too long]")
+                continue
+            if not line:
+                break
+            self.lines.append(line.decode(errors="replace").rstrip())
+
+    def text(self) -> str:
+        return "\n".join(self.lines)
+
+
+class StreamInfo(BaseModel):
+    index: int
+    codec_type: str
+    codec_name: str = ""
+
+
+class MediaInfo(BaseModel):
+    """
+    What ffprobe reports about a media file.
+
+    Attributes:
+        duration (float, optional): Duration in seconds, if known.
+        streams (List[StreamInfo]): The file's streams in index order.
+    """
+    duration: Optional[float] = None
+    streams: List[StreamInfo] = []
+
+
+async def probe_media(
+    input_path: str, binary: str = "ffprobe", timeout: Optional[float] = None
+) -> Optional[MediaInfo]:
+    """
+    Read the duration and stream codecs of a media file with ffprobe.
+
+    Returns:
+        MediaInfo, optional: None if the file cannot be probed.
+    """
+    try:
+        returncode, stdout, _ = await run_process(
+            [binary, "-v", "error",
+             "-show_entries", "format=duration:stream=index,codec_type,codec_name",
+             "-of", "json", input_path],
+            name="ffprobe",
+            timeout=timeout,
+        )
+        if returncode != 0:
+            return None
+        data = json.loads(stdout)
+        return MediaInfo(
+            duration=_float(data.get("format", {}).get("duration")),
+            streams=[StreamInfo(**stream) for stream in data.get("streams", [])],
+        )
+    except (OSError, ValueError, ProcessTimeoutError) as e:
+        logger.debug(f"Cannot probe {input_path}: {e}")
+        return None
+
+
+async def probe_keyframes(input_path: str, binary: str = "ffprobe", timeout: Optional[float] = None) -> List[float]:
+    """
+    List the keyframe timestamps of the first video stream, read from packet flags
+    without decoding.
+
+    Returns:
+        List[float]: Timestamps in seconds, in order; empty if the file cannot be probed.
+    """
+    try:
+        returncode, stdout, _ = await run_process(
+            [binary, "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "packet=pts_time,flags",
+             "-of", "csv=p=0", input_path],
+            name="ffprobe",
+            timeout=timeout,
+        )
+    except (OSError, ProcessTimeoutError) as e:
+        logger.debug(f"Cannot probe keyframes of {input_path}: {e}")
+        return []
+    if returncode != 0:
+        return []
+
+    keyframes = []
+    for line in stdout.decode(errors="replace").splitlines():
+        pts_time, _, flags = line.partition(",")
+        timestamp = _float(pts_time)
+        if "K" in flags and timestamp is not None:
+            keyframes.append(timestamp)
+    return sorted(keyframes)
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value.rstrip("x")) if value else None
+    except ValueError:
+        # "N/A" until ffmpeg has something to report
+        return None
+
+
+def parse_progress_block(block: Dict[str, str], duration: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Turn one ffmpeg `-progress` block into progress fields.
+
+    Args:
+        block (Dict[str, str]): The block's key=value pairs, ending with "progress".
+        duration (float, optional): Total input duration, enables percent and ETA.
+
+    Returns:
+        Dict[str, Any]: out_time, speed, fps, percent and eta (None when unknown).
+    """
+    # out_time_ms is in microseconds too, despite its name
+    out_time_us = _float(block.get("out_time_us") or block.get("out_time_ms"))
+    out_time = out_time_us / 1_000_000 if out_time_us is not None else None
+    speed = _float(block.get("speed"))
+    percent = eta = None
+    if duration and out_time is not None:
+        percent = round(min(100.0, max(0.0, out_time / duration * 100)), 2)
+        if speed:
+            eta = round(max(0.0, duration - out_time) / speed, 2)
+    if block.get("progress") == "end":
+        percent, eta = (100.0 if duration else None), 0.0
+    return {"out_time": out_time, "speed": speed, "fps": _float(block.get("fps")), "percent": percent, "eta": eta}
+
+
+async def run_ffmpeg(
+    args: List[str],
+    binary: str = "ffmpeg",
+    duration: Optional[float] = None,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    stderr_lines: int = 100,
+    timeout: Optional[float] = None,
+    limits: Optional[ResourceLimits] = None,
+):
+    """
+    Run ffmpeg, reporting progress from its `-progress pipe:1` output as it goes.
+
+    `args` must contain PROGRESS_ARGS. Only the last `stderr_lines` lines of
+    stderr are kept, for the error message. ffmpeg is killed when `timeout`
+    expires or the caller is cancelled.
+
+    Raises:
+        RuntimeError: If ffmpeg exits with an error.
+        ProcessTimeoutError: If ffmpeg runs longer than `timeout` seconds.
+    """
+    tail = StderrTail(stderr_lines)
+    async with managed_process([binary, *args], name="ffmpeg", timeout=timeout, limits=limits) as process:
+        stderr_task = asyncio.create_task(tail.consume(process.stderr))
+        try:
+            block: Dict[str, str] = {}
+            while True:
+                line = await process.stdout.readline()
+                if not line:
+                    break
+                key, _, value = line.decode(errors="replace").strip().partition("=")
+                block[key] = value
+                # Every block ends with progress=continue or progress=end
+                if key == "progress":
+                    if on_progress:
+                        on_progress(parse_progress_block(block, duration))
+                    block = {}
+            await stderr_task
+            returncode = await process.wait()
+        finally:
+            stderr_task.cancel()
+
+    if returncode != 0:
+        error_msg = tail.text().strip()
+        logger.error(f"FFmpeg failed: {error_msg}")
+        raise RuntimeError(f"Video conversion failed: {error_msg}")
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.office_pool import build_soffice_args, get_office_pool, run_soffice
+
+# Runs one soffice invocation converting every input into the given directory
+BatchRunner = Callable[[List[str], str], Awaitable[None]]
+
+# (input_path, output_path, future)
+PendingItem = Tuple[str, str, asyncio.Future]
+
+
+class OfficeBatcher:
+    """
+    Micro-batching stage in front of LibreOffice.
+
+    Conversion requests arriving within `window` seconds of each other (or until
+    `max_size` are waiting) are converted by a single soffice invocation, spreading
+    its startup cost over the whole batch. Each output is moved back to the path
+    its request asked for.
+    """
+
+    def __init__(self, runner: BatchRunner, window: float = 0.1, max_size: int = 8):
+        self._runner = runner
+        self._window = window
+        self._max_size = max_size
+        self._pending: List[PendingItem] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def convert(self, input_path: str, output_path: str) -> str:
+        """
+        Queue a document for the next batch and wait for its PDF.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((input_path, output_path, future))
+
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._window, self._flush)
+
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._pending = self._pending, []
+        # soffice names outputs after the input stem, so equal stems must go to separate runs
+        for group in self._split_by_stem(items):
+            asyncio.create_task(self._run_batch(group))
+
+    @staticmethod
+    def _split_by_stem(items: List[PendingItem]) -> List[List[PendingItem]]:
+        groups: List[List[PendingItem]] = []
+        for item in items:
+            stem = os.path.splitext(os.path.basename(item[0]))[0]
+            for group in groups:
+                if all(os.path.splitext(os.path.basename(other[0]))[0] != stem for other in group):
+                    group.append(item)
+                    break
+            else:
+                groups.append([item])
+        return groups
+
+    async def _run_batch(self, items: List[PendingItem]):
+        batch_dir = None
+        try:
+            # Next to the outputs, so results are moved into place by a rename
+            batch_dir = tempfile.mkdtemp(prefix="office-batch-", dir=os.path.dirname(items[0][1]) or None)
+            logger.info(f"Converting batch of {len(items)} office documents")
+            try:
+                await self._runner([item[0] for item in items], batch_dir)
+            except Exception as e:
+                if len(items) == 1:
+                    items[0][2].set_exception(e)
+                    return
+                # One bad document fails the whole invocation; retry individually
+                logger.warning(f"Office batch failed ({e}), retrying {len(items)} documents one by one")
+                await asyncio.gather(*[self._run_batch([item]) for item in items])
+                return
+
+            for input_path, output_path, future in items:
+                produced = os.path.join(batch_dir, os.path.splitext(os.path.basename(input_path))[0] + ".pdf")
+                if future.done():
+                    continue
+                if os.path.exists(produced):
+                    shutil.move(produced, output_path)
+                    future.set_result(output_path)
+                else:
+                    future.set_exception(RuntimeError(f"Office conversion produced no output for {input_path}"))
+        except Exception as e:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            if batch_dir:
+                shutil.rmtree(batch_dir, ignore_errors=True)
+
+
+async def _run_cold_batch(input_paths: List[str], output_dir: str):
+    settings = get_settings()
+    await run_soffice(build_soffice_args(input_paths, output_dir), settings.SOFFICE_BINARY, len(input_paths))
+
+
+@lru_cache
+def get_office_batcher() -> OfficeBatcher:
+    settings = get_settings()
+    runner = get_office_pool().convert_batch if settings.OFFICE_POOL_ENABLED else _run_cold_batch
+    return OfficeBatcher(
+        runner,
+        window=settings.OFFICE_BATCH_WINDOW_MS / 1000,
+        max_size=settings.OFFICE_BATCH_MAX_SIZE,
+    )
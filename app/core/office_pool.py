@@ -0,0 +1,397 @@
+import asyncio
+import os
+import shutil
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from app.core.config import get_settings
+from app.core.executor import Workload, get_executor_pool
+from app.core.subprocess_runner import get_resource_limits, run_process
+
+try:
+    # Python-UNO bridge shipped with LibreOffice (python3-uno); optional
+    import uno
+    from com.sun.star.beans import PropertyValue
+except ImportError:
+    uno = None
+    PropertyValue = None
+
+
+# LibreOffice export filters per source extension
+PDF_EXPORT_FILTERS = {
+    ".doc": "writer_pdf_Export",
+    ".docx": "writer_pdf_Export",
+    ".odt": "writer_pdf_Export",
+    ".rtf": "writer_pdf_Export",
+    ".ppt": "impress_pdf_Export",
+    ".pptx": "impress_pdf_Export",
+    ".odp": "impress_pdf_Export",
+    ".xls": "calc_pdf_Export",
+    ".xlsx": "calc_pdf_Export",
+    ".ods": "calc_pdf_Export",
+}
+
+
+def build_soffice_args(input_paths: List[str], output_dir: str, profile_dir: Optional[str] = None) -> List[str]:
+    """
+    Build the arguments for a one-shot `soffice --convert-to pdf` invocation.
+
+    Args:
+        input_paths (list[str]): Documents to convert.
+        output_dir (str): Directory receiving the PDFs (same base names as the inputs).
+        profile_dir (str, optional): Isolated user profile, avoids contention on the default one.
+    """
+    args = []
+    if profile_dir:
+        args.append(f"-env:UserInstallation={Path(profile_dir).resolve().as_uri()}")
+    args.extend(["--headless", "--convert-to", "pdf", "--outdir", output_dir])
+    args.extend(input_paths)
+    return args
+
+
+async def run_soffice(args: List[str], binary: str = "soffice", documents: int = 1):
+    """
+    Run soffice with the given arguments and raise on failure.
+
+    soffice is killed, with any helper processes, after SOFFICE_TIMEOUT seconds
+    per document or when the caller is cancelled.
+
+    Raises:
+        RuntimeError: If soffice exits with an error.
+        ProcessTimeoutError: If soffice does not finish in time.
+    """
+    logger.info(f"Running soffice: {binary} {' '.join(args)}")
+
+    returncode, stdout, stderr = await run_process(
+        [binary, *args],
+        name="soffice",
+        timeout=get_settings().SOFFICE_TIMEOUT * documents,
+        limits=get_resource_limits(),
+    )
+
+    if returncode != 0:
+        error_msg = stderr.decode().strip()
+        # LibreOffice sometimes writes mild warnings to stderr, check returncode strictly
+        logger.error(f"LibreOffice failed: {error_msg}")
+        raise RuntimeError(f"Office conversion failed: {error_msg}")
+
+
+class OfficeInstance:
+    """
+    One pooled LibreOffice worker with its own isolated user profile.
+
+    With the Python-UNO bridge available the instance keeps a headless soffice
+    resident, listening on a local socket, and documents are converted through
+    UNO without paying the startup cost. Without UNO the instance only owns a
+    warm profile, and each conversion is a one-shot soffice run against it.
+    """
+
+    def __init__(self, index: int, profile_root: str, port: int, binary: str = "soffice"):
+        self.index = index
+        self.port = port
+        self.binary = binary
+        self.profile_dir = os.path.abspath(os.path.join(profile_root, f"instance-{index}"))
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.jobs_done = 0
+        self.restarts = 0
+
+    @property
+    def resident(self) -> bool:
+        return uno is not None
+
+    @property
+    def accept_string(self) -> str:
+        return f"socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+
+    async def start(self, timeout: float):
+        """
+        Start the resident soffice listener and wait until it accepts connections.
+        """
+        os.makedirs(self.profile_dir, exist_ok=True)
+        if not self.resident:
+            return
+
+        args = [
+            f"-env:UserInstallation={Path(self.profile_dir).as_uri()}",
+            "--headless", "--invisible", "--nologo", "--norestore", "--nodefault", "--nolockcheck",
+            f"--accept={self.accept_string}",
+        ]
+        logger.info(f"Starting LibreOffice instance {self.index} on port {self.port}")
+        self.process = await asyncio.create_subprocess_exec(
+            self.binary,
+            *args,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if await self.is_healthy():
+                self.jobs_done = 0
+                return
+            await asyncio.sleep(0.25)
+
+        await self.stop()
+        raise RuntimeError(f"LibreOffice instance {self.index} did not start within {timeout}s")
+
+    async def is_healthy(self) -> bool:
+        """
+        Check that the resident process is alive and its listener accepts connections.
+        Profile-only instances are always healthy.
+        """
+        if not self.resident:
+            return True
+        if self.process is None or self.process.returncode is not None:
+            return False
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", self.port), timeout=2)
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        await writer.wait_closed()
+        return True
+
+    async def stop(self):
+        if self.process is None or self.process.returncode is not None:
+            self.process = None
+            return
+        self.process.terminate()
+        try:
+            await asyncio.wait_for(self.process.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            self.process.kill()
+            await self.process.wait()
+        self.process = None
+
+    async def restart(self, timeout: float, reset_profile: bool = False):
+        """
+        Restart the instance, optionally wiping its profile (after a crash it may be corrupt).
+        """
+        await self.stop()
+        if reset_profile:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+        self.restarts += 1
+        await self.start(timeout)
+
+    async def convert(self, input_path: str, output_path: str):
+        """
+        Convert a single document to PDF at `output_path`.
+        """
+        if self.resident:
+            await get_executor_pool().run(Workload.IO, self._convert_uno, input_path, output_path)
+        else:
+            output_dir = os.path.dirname(output_path)
+            await run_soffice(build_soffice_args([input_path], output_dir, self.profile_dir), self.binary)
+            produced = os.path.join(output_dir, os.path.splitext(os.path.basename(input_path))[0] + ".pdf")
+            if produced != output_path and os.path.exists(produced):
+                shutil.move(produced, output_path)
+        self.jobs_done += 1
+
+    def _convert_uno(self, input_path: str, output_path: str):
+        """
+        Load the document into the resident instance and export it as PDF. Blocking.
+        """
+        def prop(name, value):
+            p = PropertyValue()
+            p.Name = name
+            p.Value = value
+            return p
+
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_ctx)
+        ctx = resolver.resolve(f"uno:{self.accept_string}")
+        desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+
+        ext = os.path.splitext(input_path)[1].lower()
+        export_filter = PDF_EXPORT_FILTERS.get(ext, "writer_pdf_Export")
+        document = desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(input_path)), "_blank", 0, (prop("Hidden", True),)
+        )
+        if document is None:
+            raise RuntimeError(f"LibreOffice could not load {input_path}")
+        try:
+            document.storeToURL(
+                uno.systemPathToFileUrl(os.path.abspath(output_path)), (prop("FilterName", export_filter),)
+            )
+        finally:
+            document.close(True)
+
+
+class OfficePool:
+    """
+    Pool of warm LibreOffice instances, one conversion per instance at a time.
+
+    Instances are started on first use, health-checked before every lease and
+    periodically while idle, restarted after `max_jobs` conversions and restarted
+    with a fresh profile after a crash or failed conversion.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        profile_root: str,
+        base_port: int = 2002,
+        max_jobs: int = 200,
+        start_timeout: float = 30,
+        health_interval: float = 30,
+        binary: str = "soffice",
+    ):
+        self._instances = [OfficeInstance(i, profile_root, base_port + i, binary) for i in range(size)]
+        self._max_jobs = max_jobs
+        self._start_timeout = start_timeout
+        self._health_interval = health_interval
+        self._idle: Optional[asyncio.Queue] = None
+        self._health_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._started: set = set()
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._started = set()
+        self._idle = asyncio.Queue()
+        for instance in self._instances:
+            self._idle.put_nowait(instance)
+        if self._health_interval and self._instances[0].resident:
+            self._health_task = asyncio.create_task(self._health_loop(), name="office-pool-health")
+        mode = "resident" if self._instances[0].resident else "profile-only"
+        logger.info(f"Office pool ready: {len(self._instances)} instances ({mode})")
+
+    async def warm_up(self):
+        """
+        Start every instance ahead of the first request.
+        """
+        self._ensure_started()
+        leased = [await self._idle.get() for _ in self._instances]
+        try:
+            await asyncio.gather(*[self._prepare(instance) for instance in leased])
+        finally:
+            for instance in leased:
+                self._idle.put_nowait(instance)
+
+    async def _prepare(self, instance: OfficeInstance):
+        """
+        Make a leased instance ready for work: start, recycle or revive it as needed.
+        """
+        if instance.index not in self._started:
+            await instance.start(self._start_timeout)
+            self._started.add(instance.index)
+        elif instance.jobs_done >= self._max_jobs:
+            logger.info(f"Recycling LibreOffice instance {instance.index} after {instance.jobs_done} jobs")
+            await instance.restart(self._start_timeout)
+        elif not await instance.is_healthy():
+            logger.warning(f"LibreOffice instance {instance.index} is unhealthy, restarting")
+            await instance.restart(self._start_timeout, reset_profile=True)
+
+    async def convert(self, input_path: str, output_path: str) -> str:
+        """
+        Convert a document to PDF on the next free instance.
+        """
+        self._ensure_started()
+        instance = await self._idle.get()
+        try:
+            await self._prepare(instance)
+            try:
+                await instance.convert(input_path, output_path)
+            except Exception:
+                # A failed conversion may leave the instance wedged; start it over
+                if instance.resident:
+                    self._started.discard(instance.index)
+                    await instance.stop()
+                raise
+            return output_path
+        finally:
+            self._idle.put_nowait(instance)
+
+    async def convert_batch(self, input_paths: List[str], output_dir: str):
+        """
+        Convert several documents to PDFs in `output_dir` on the next free instance.
+        Profile-only instances handle the whole batch in a single soffice invocation.
+        """
+        self._ensure_started()
+        instance = await self._idle.get()
+        try:
+            await self._prepare(instance)
+            if instance.resident:
+                for input_path in input_paths:
+                    stem = os.path.splitext(os.path.basename(input_path))[0]
+                    await instance.convert(input_path, os.path.join(output_dir, f"{stem}.pdf"))
+            else:
+                await run_soffice(
+                    build_soffice_args(input_paths, output_dir, instance.profile_dir), instance.binary, len(input_paths)
+                )
+                instance.jobs_done += len(input_paths)
+        finally:
+            self._idle.put_nowait(instance)
+
+    @property
+    def resident(self) -> bool:
+        return self._instances[0].resident
+
+    async def health_check(self) -> Dict[int, bool]:
+        """
+        Check idle instances and restart the ones that died.
+
+        Returns:
+            Dict[int, bool]: Health of each checked instance (before any restart).
+        """
+        self._ensure_started()
+        results = {}
+        for _ in range(self._idle.qsize()):
+            instance = self._idle.get_nowait()
+            try:
+                if instance.index in self._started:
+                    healthy = await instance.is_healthy()
+                    results[instance.index] = healthy
+                    if not healthy:
+                        logger.warning(f"LibreOffice instance {instance.index} failed health check, restarting")
+                        await instance.restart(self._start_timeout, reset_profile=True)
+            except Exception as e:
+                logger.error(f"Failed to restart LibreOffice instance {instance.index}: {e}")
+                self._started.discard(instance.index)
+            finally:
+                self._idle.put_nowait(instance)
+        return results
+
+    async def _health_loop(self):
+        while True:
+            await asyncio.sleep(self._health_interval)
+            await self.health_check()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "size": len(self._instances),
+            "idle": self._idle.qsize() if self._idle else len(self._instances),
+            "resident": self._instances[0].resident,
+            "jobs_done": sum(i.jobs_done for i in self._instances),
+            "restarts": sum(i.restarts for i in self._instances),
+        }
+
+    async def shutdown(self):
+        if self._health_task:
+            self._health_task.cancel()
+            await asyncio.gather(self._health_task, return_exceptions=True)
+            self._health_task = None
+        for instance in self._instances:
+            await instance.stop()
+        self._loop = None
+
+
+@lru_cache
+def get_office_pool() -> OfficePool:
+    settings = get_settings()
+    return OfficePool(
+        size=settings.OFFICE_POOL_SIZE,
+        profile_root=settings.OFFICE_POOL_PROFILE_DIR,
+        base_port=settings.OFFICE_POOL_BASE_PORT,
+        max_jobs=settings.OFFICE_POOL_MAX_JOBS,
+        start_timeout=settings.OFFICE_POOL_START_TIMEOUT,
+        health_interval=settings.OFFICE_POOL_HEALTH_INTERVAL,
+        binary=settings.SOFFICE_BINARY,
+    )
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class Progress(BaseModel):
+    """
+    Snapshot of a running conversion.
+
+    Attributes:
+        status (str): "pending", "running" or "done".
+        percent (float, optional): Completion in percent, when the total is known.
+        out_time (float, optional): Seconds of media written so far.
+        duration (float, optional): Total media duration in seconds.
+        speed (float, optional): Media seconds processed per wall-clock second.
+        fps (float, optional): Frames encoded per second.
+        eta (float, optional): Estimated seconds until the conversion finishes.
+        updated_at (float): Timestamp of the last update (epoch seconds).
+    """
+    status: str = "pending"
+    percent: Optional[float] = None
+    out_time: Optional[float] = None
+    duration: Optional[float] = None
+    speed: Optional[float] = None
+    fps: Optional[float] = None
+    eta: Optional[float] = None
+    updated_at: float = 0.0
+
+
+class ProgressTracker:
+    """
+    Latest progress of one conversion, with change notification for streaming clients.
+    Must be updated from the event loop.
+    """
+
+    def __init__(self):
+        self.progress = Progress(updated_at=time.time())
+        self.version = 0
+        self._changed = asyncio.Event()
+
+    def update(self, **fields):
+        self.progress = self.progress.model_copy(update={**fields, "updated_at": time.time()})
+        self.version += 1
+        # Wake everyone waiting for this version, then arm a fresh event for the next one
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_for_change(self, version: int, timeout: float) -> bool:
+        """
+        Wait until the progress moves past `version`.
+
+        Returns:
+            bool: False if nothing changed within the timeout.
+        """
+        if self.version != version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+# Tracker of the conversion running in the current task, set by the job scheduler
+current_progress: ContextVar[Optional[ProgressTracker]] = ContextVar("current_progress", default=None)
+
+
+def report_progress(**fields):
+    """
+    Publish progress of the current conversion. A no-op outside a tracked job.
+    """
+    tracker = current_progress.get()
+    if tracker is not None:
+        tracker.update(**fields)
@@ -0,0 +1,38 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Details about how the current conversion was performed, collected by the caller
+current_details: ContextVar[Optional[Dict[str, str]]] = ContextVar("current_details", default=None)
+
+
+@contextmanager
+def collect_details() -> Iterator[Dict[str, str]]:
+    """
+    Collect the details plugins report while the block runs.
+
+    Yields:
+        Dict[str, str]: Filled in as the conversion reports details, e.g. {"strategy": "remux"}.
+    """
+    details: Dict[str, str] = {}
+    token = current_details.set(details)
+    try:
+        yield details
+    finally:
+        current_details.reset(token)
+
+
+def report_detail(key: str, value: str):
+    """
+    Record a detail of the current conversion. A no-op when nobody collects them.
+    """
+    details = current_details.get()
+    if details is not None:
+        details[key] = value
+
+
+def detail_headers(details: Dict[str, str]) -> Dict[str, str]:
+    """
+    Response headers for conversion details, e.g. X-Conversion-Strategy.
+    """
+    return {f"X-Conversion-{key.replace('_', '-').title()}": value for key, value in details.items()}
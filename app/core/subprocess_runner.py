@@ -0,0 +1,180 @@
+import asyncio
+import os
+import signal
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.config import get_settings
+
+try:
+    # POSIX only; limits are not applied elsewhere
+    import resource
+except ImportError:
+    resource = None
+
+
+class ResourceLimits(BaseModel):
+    """
+    rlimits applied to a child process before it starts. Unset limits are left alone.
+
+    Attributes:
+        cpu_seconds (int, optional): CPU time, the process gets SIGXCPU/SIGKILL beyond it.
+        memory_bytes (int, optional): Address space size; allocations beyond it fail.
+        file_size_bytes (int, optional): Largest file the process may write.
+    """
+    cpu_seconds: Optional[int] = None
+    memory_bytes: Optional[int] = None
+    file_size_bytes: Optional[int] = None
+
+    def preexec_fn(self) -> Optional[Callable[[], None]]:
+        """
+        Function setting the limits in the child, or None if there is nothing to set.
+        """
+        if resource is None:
+            return None
+        limits = [
+            (limit, value)
+            for limit, value in (
+                (resource.RLIMIT_CPU, self.cpu_seconds),
+                (resource.RLIMIT_AS, self.memory_bytes),
+                (resource.RLIMIT_FSIZE, self.file_size_bytes),
+            )
+            if value is not None
+        ]
+        if not limits:
+            return None
+
+        def apply():
+            for limit, value in limits:
+                resource.setrlimit(limit, (value, value))
+
+        return apply
+
+
+@lru_cache
+def get_resource_limits() -> ResourceLimits:
+    """
+    Limits for conversion subprocesses, from the SUBPROCESS_MAX_* settings.
+    """
+    settings = get_settings()
+    return ResourceLimits(
+        cpu_seconds=settings.SUBPROCESS_MAX_CPU_SECONDS,
+        memory_bytes=settings.SUBPROCESS_MAX_MEMORY_BYTES,
+        file_size_bytes=settings.SUBPROCESS_MAX_FILE_BYTES,
+    )
+
+
+class ProcessTimeoutError(RuntimeError):
+    """
+    A child process ran longer than its wall-clock timeout and was killed.
+    """
+
+
+class ProcessStats:
+    """
+    Counters of child processes per program: started, timed out, and killed
+    (after a timeout or because the caller was cancelled).
+    """
+
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(lambda: {"started": 0, "timeouts": 0, "killed": 0})
+
+    def count(self, name: str, counter: str):
+        self._counters[name][counter] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(counters) for name, counters in self._counters.items()}
+
+
+process_stats = ProcessStats()
+
+
+def kill_process_group(process: asyncio.subprocess.Process):
+    """
+    Kill a process started by `managed_process` and every child it spawned.
+    """
+    try:
+        if os.name == "posix":
+            # The process leads its own session, so its group id is its pid
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+@asynccontextmanager
+async def managed_process(
+    args: List[str],
+    name: Optional[str] = None,
+    timeout: Optional[float] = None,
+    limits: Optional[ResourceLimits] = None,
+    stdout=asyncio.subprocess.PIPE,
+    stderr=asyncio.subprocess.PIPE,
+) -> AsyncIterator[asyncio.subprocess.Process]:
+    """
+    Start a child process in its own process group and make sure it does not outlive the block.
+
+    If the block is still running after `timeout` seconds it is cancelled and
+    ProcessTimeoutError is raised. Whenever the block exits while the process is
+    still running (timeout, cancelled request, error), the whole process group
+    is killed, so helpers spawned by the program go too.
+
+    Args:
+        args (List[str]): The program and its arguments.
+        name (str, optional): Name the process is counted under; defaults to the program name.
+        timeout (float, optional): Wall-clock limit for the block, in seconds.
+        limits (ResourceLimits, optional): rlimits for the child.
+
+    Raises:
+        ProcessTimeoutError: If the timeout expires.
+    """
+    name = name or os.path.basename(args[0])
+    preexec_fn = limits.preexec_fn() if limits else None
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=stdout,
+        stderr=stderr,
+        start_new_session=True,
+        preexec_fn=preexec_fn,
+    )
+    process_stats.count(name, "started")
+    try:
+        async with asyncio.timeout(timeout):
+            yield process
+    except TimeoutError:
+        process_stats.count(name, "timeouts")
+        logger.warning(f"{name} (pid {process.pid}) exceeded its {timeout}s timeout")
+        raise ProcessTimeoutError(f"{name} did not finish within {timeout}s")
+    finally:
+        if process.returncode is None:
+            kill_process_group(process)
+            process_stats.count(name, "killed")
+            logger.warning(f"Killed {name} (pid {process.pid})")
+            # Reap it; a killed process exits at once
+            await asyncio.shield(process.wait())
+
+
+async def run_process(
+    args: List[str],
+    name: Optional[str] = None,
+    timeout: Optional[float] = None,
+    limits: Optional[ResourceLimits] = None,
+) -> Tuple[int, bytes, bytes]:
+    """
+    Run a child process to completion under `managed_process`.
+
+    Returns:
+        Tuple[int, bytes, bytes]: Exit code, stdout and stderr.
+
+    Raises:
+        ProcessTimeoutError: If the timeout expires.
+    """
+    async with managed_process(args, name, timeout, limits) as process:
+        stdout, stderr = await process.communicate()
+    return process.returncode, stdout, stderr
@@ -1,44 +1,86 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Dict, FrozenSet, Tuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_validator
+
+from app.core.executor import Workload, get_executor_pool
+
+
+def normalize_format(fmt: str) -> str:
+    """
+    Normalize a format extension to lower case with a leading dot ("PDF" -> ".pdf").
+    """
+    fmt = fmt.strip().lower()
+    return fmt if fmt.startswith(".") else f".{fmt}"
 
 
 class ConverterMeta(BaseModel):
     """
-    Metadata for a converter plugin.
+    Metadata for a converter plugin. Immutable; formats are normalized to ".ext".
 
     Attributes:
         name (str): Unique name of the plugin (e.g., "word2pdf").
         description (str): Brief description of what the plugin does.
         source_format (str): The extension of the source file (e.g., ".docx").
-        supported_targets (list[str]): List of supported target format extensions (e.g., [".pdf", ".txt"]).
+        supported_targets (tuple[str, ...]): Supported target format extensions (e.g., (".pdf", ".txt")).
     """
+    model_config = ConfigDict(frozen=True)
+
     name: str
     description: str
     source_format: str
-    supported_targets: list[str]
+    supported_targets: Tuple[str, ...]
+
+    _target_set: FrozenSet[str] = PrivateAttr()
+
+    @field_validator("source_format")
+    @classmethod
+    def _normalize_source(cls, value: str) -> str:
+        return normalize_format(value)
+
+    @field_validator("supported_targets")
+    @classmethod
+    def _normalize_targets(cls, value: Tuple[str, ...]) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(normalize_format(target) for target in value))
+
+    def model_post_init(self, __context: Any):
+        self._target_set = frozenset(self.supported_targets)
+
+    def supports(self, target_format: str) -> bool:
+        """
+        Whether the plugin converts to the given format ("pdf" and ".PDF" are accepted).
+        """
+        return normalize_format(target_format) in self._target_set
 
 
 class BaseConverter(ABC):
     """
     Abstract base class for all file converters.
     All converter plugins must inherit from this class and implement the abstract methods.
+
+    Attributes:
+        workload (Workload): The kind of work the plugin performs. Plugins that do
+            blocking work implement `convert_sync` and the service runs it in the
+            executor pool matching this value.
     """
 
+    workload: Workload = Workload.IO
+
     @property
     @abstractmethod
     def meta(self) -> ConverterMeta:
         """
         Metadata for the converter.
-        Must be implemented by subclasses to provide plugin details.
+        Must be implemented by subclasses to provide plugin details,
+        as a `functools.cached_property` so it is built only once.
         """
         pass
 
-    @abstractmethod
     async def convert(self, input_path: str, output_path: str, target_format: str, **kwargs: Any) -> str:
         """
         Execute the file conversion logic.
+        Plugins either override this coroutine or implement `convert_sync`,
+        in which case the blocking work is offloaded to the executor pool.
 
         Args:
             input_path (str): Absolute path to the input file.
@@ -49,7 +91,47 @@ class BaseConverter(ABC):
         Returns:
             str: The absolute path of the converted output file.
         """
-        pass
+        if not self.is_blocking():
+            raise NotImplementedError(f"{type(self).__name__} must implement convert or convert_sync")
+        return await get_executor_pool().run(
+            self.workload, self.convert_sync, input_path, output_path, target_format, **kwargs
+        )
+
+    def convert_sync(self, input_path: str, output_path: str, target_format: str, **kwargs: Any) -> str:
+        """
+        Blocking variant of `convert`, executed inside an executor pool.
+        Must not touch the event loop. Arguments and return value match `convert`.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def is_blocking(cls) -> bool:
+        """
+        Whether the plugin implements its work synchronously via `convert_sync`.
+        """
+        return cls.convert_sync is not BaseConverter.convert_sync
+
+    def convert_many_sync(self, input_path: str, outputs: Dict[str, str], **kwargs: Any) -> Dict[str, str]:
+        """
+        Blocking conversion of one input into several targets, parsing the source once.
+        Optional: plugins without it get one `convert` call per target.
+
+        Args:
+            input_path (str): Absolute path to the input file.
+            outputs (Dict[str, str]): Output path for each target format extension.
+            **kwargs: Additional keyword arguments, shared by all targets.
+
+        Returns:
+            Dict[str, str]: The path actually written for each target format.
+        """
+        raise NotImplementedError
+
+    @classmethod
+    def converts_many(cls) -> bool:
+        """
+        Whether the plugin implements `convert_many_sync`.
+        """
+        return cls.convert_many_sync is not BaseConverter.convert_many_sync
 
     async def validate(self, input_path: str) -> bool:
         """
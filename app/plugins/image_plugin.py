@@ -1,8 +1,9 @@
+from functools import cached_property
 from typing import Any
 from PIL import Image
 from loguru import logger
 
-from app.plugins.base import BaseConverter, ConverterMeta
+from app.plugins.base import BaseConverter, ConverterMeta, Workload
 
 
 class ImageConverter(BaseConverter):
@@ -11,6 +12,8 @@ class ImageConverter(BaseConverter):
     Supports basic image format conversions (JPG, PNG, WEBP) and Image-to-PDF.
     """
 
+    workload = Workload.CPU
+
     def __init__(self, source_format: str):
         self._source_format = source_format
 
@@ -18,7 +21,7 @@ class ImageConverter(BaseConverter):
     def supported_source_formats(cls) -> list[str]:
         return [".jpg", ".jpeg", ".png", ".webp"]
 
-    @property
+    @cached_property
     def meta(self) -> ConverterMeta:
         return ConverterMeta(
             name=f"image-converter-{self._source_format.strip('.')}",
@@ -27,8 +30,8 @@ class ImageConverter(BaseConverter):
             supported_targets=[".png", ".jpg", ".jpeg", ".webp", ".pdf"],
         )
 
-    async def convert(self, input_path: str, output_path: str, target_format: str, **kwargs: Any) -> str:
-        if target_format not in self.meta.supported_targets:
+    def convert_sync(self, input_path: str, output_path: str, target_format: str, **kwargs: Any) -> str:
+        if not self.meta.supports(target_format):
             raise ValueError(f"Target format {target_format} is not supported by {self.meta.name}")
 
         try:
@@ -1,4 +1,5 @@
 import json
+from functools import cached_property
 from typing import Any
 
 import aiofiles
@@ -16,7 +17,7 @@ class JsonToMdConverter(BaseConverter):
     def supported_source_formats(cls) -> list[str]:
         return [".json"]
 
-    @property
+    @cached_property
     def meta(self) -> ConverterMeta:
         return ConverterMeta(
             name="json2md",
@@ -41,7 +42,7 @@ class JsonToMdConverter(BaseConverter):
         Raises:
             ValueError: If the input file is not valid JSON or target format is unsupported.
         """
-        if target_format not in self.meta.supported_targets:
+        if not self.meta.supports(target_format):
             raise ValueError(f"Target format {target_format} is not supported by {self.meta.name}")
         try:
             # Asynchronously read the input JSON file
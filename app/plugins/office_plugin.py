@@ -1,21 +1,27 @@
-import asyncio
 import os
 import shutil
-from app.plugins.base import BaseConverter, ConverterMeta
-from app.core.logger import logger
+from functools import cached_property
+from app.plugins.base import BaseConverter, ConverterMeta, Workload
+from app.core.config import get_settings
+from app.core.office_batch import get_office_batcher
+from app.core.office_pool import build_soffice_args, get_office_pool, run_soffice
+
+settings = get_settings()
 
 class OfficeConverter(BaseConverter):
     """
     Converter for Office documents using LibreOffice (soffice).
     """
 
-    @property
+    workload = Workload.SUBPROCESS
+
+    @cached_property
     def meta(self) -> ConverterMeta:
         return ConverterMeta(
             name="office-converter",
             description="Converts Office documents using LibreOffice.",
             source_format=".docx", # Dynamic registration handles others
-            supported_targets=["pdf"]
+            supported_targets=[".pdf"]
         )
     
     def __init__(self, source_format: str = ".docx"):
@@ -32,6 +38,16 @@ class OfficeConverter(BaseConverter):
         if target_format.lower() != ".pdf":
              raise ValueError(f"OfficeConverter only supports PDF output, got {target_format}")
 
+        pool = get_office_pool() if settings.OFFICE_POOL_ENABLED else None
+
+        if settings.OFFICE_BATCH_ENABLED and not (pool and pool.resident):
+            # One soffice run per batch of concurrent documents amortizes its startup
+            return await get_office_batcher().convert(input_path, output_path)
+
+        if pool:
+            # Warm instance with an isolated profile, no per-document startup cost
+            return await pool.convert(input_path, output_path)
+
         # soffice --headless --convert-to pdf --outdir {output_dir} {input_path}
         # Note: soffice outputs the file with the same name but .pdf extension in the outdir.
         # We need to make sure we align with the service's expected output_path.
@@ -40,37 +56,7 @@ class OfficeConverter(BaseConverter):
         expected_filename = os.path.splitext(os.path.basename(input_path))[0] + ".pdf"
         actual_output_path = os.path.join(output_dir, expected_filename)
 
-        args = [
-            "--headless",
-            "--convert-to", "pdf",
-            "--outdir", output_dir,
-            input_path
-        ]
-        
-        # On Windows it might be 'soffice.exe' or need full path. 
-        # On Linux/Docker it's 'soffice'.
-        # We assume 'soffice' is in PATH.
-        cmd = "soffice"
-        if os.name == 'nt':
-             # Fallback check for common windows paths or assume 'soffice' is in PATH
-             pass
-
-        logger.info(f"Running soffice: {cmd} {' '.join(args)}")
-
-        process = await asyncio.create_subprocess_exec(
-            cmd,
-            *args,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-
-        stdout, stderr = await process.communicate()
-
-        if process.returncode != 0:
-            error_msg = stderr.decode().strip()
-            # LibreOffice sometimes writes mild warnings to stderr, check returncode strictly
-            logger.error(f"LibreOffice failed: {error_msg}")
-            raise RuntimeError(f"Office conversion failed: {error_msg}")
+        await run_soffice(build_soffice_args([input_path], output_dir), settings.SOFFICE_BINARY)
 
         # Ideally, we should now rename/move the file if output_path is different from actual_output_path
         # But usually converter_service asks for [name].pdf so it matches.
@@ -1,10 +1,123 @@
+import multiprocessing
 import os
-from typing import Any
+import shutil
+import tempfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import cached_property
+from typing import Any, Dict, List, Optional, TextIO, Tuple
 import fitz  # PyMuPDF
 from pdf2docx import Converter as Pdf2DocxConverter
 from loguru import logger
 
-from app.plugins.base import BaseConverter, ConverterMeta
+from app.core.config import get_settings
+from app.core.executor import get_executor_pool
+from app.plugins.base import BaseConverter, ConverterMeta, Workload
+
+settings = get_settings()
+
+MD_TEXT_HEADER = "# Extracted Text\n\n```text\n"
+MD_TEXT_FOOTER = "\n```"
+
+
+def page_shards(page_count: int, shard_size: int) -> List[Tuple[int, int]]:
+    """
+    Split [0, page_count) into consecutive (start, end) ranges of at most shard_size pages.
+    """
+    return [(start, min(start + shard_size, page_count)) for start in range(0, page_count, shard_size)]
+
+
+def parse_page_range(spec: Any, page_count: int) -> List[int]:
+    """
+    Parse a 1-based page selection such as "1-3,7,10-" or "all" into 0-based page numbers.
+
+    Raises:
+        ValueError: If the selection is malformed or outside the document.
+    """
+    spec = str(spec).strip().lower()
+    if spec in ("", "all"):
+        return list(range(page_count))
+
+    numbers: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        try:
+            if "-" in part:
+                first, last = part.split("-", 1)
+                start = int(first) if first else 1
+                end = int(last) if last else page_count
+            else:
+                start = end = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid page range: {spec}")
+        if start < 1 or end > page_count or start > end:
+            raise ValueError(f"Page range {part} is outside the document (1-{page_count})")
+        numbers.extend(range(start - 1, end))
+    return sorted(set(numbers))
+
+
+def render_pages(input_path: str, page_numbers: List[int], zoom: float, out_dir: str) -> List[str]:
+    """
+    Render pages to PNG files with a private document handle, one pixmap at a time.
+    Runs in a worker process.
+
+    Returns:
+        List[str]: The PNG paths, in the order of page_numbers.
+    """
+    paths = []
+    matrix = fitz.Matrix(zoom, zoom)
+    with fitz.open(input_path) as doc:
+        for number in page_numbers:
+            path = os.path.join(out_dir, f"page-{number + 1:04d}.png")
+            doc[number].get_pixmap(matrix=matrix).save(path)
+            paths.append(path)
+    return paths
+
+
+def extract_text_shard(input_path: str, start: int, end: int, part_path: Optional[str] = None) -> Optional[str]:
+    """
+    Extract the text of pages [start, end) with a private document handle.
+    Runs in a worker process.
+
+    Args:
+        part_path (str, optional): Write the text there page by page instead of returning it.
+
+    Returns:
+        str, optional: The shard text when no part_path is given.
+    """
+    with fitz.open(input_path) as doc:
+        if part_path is None:
+            return "".join(doc[i].get_text() for i in range(start, end))
+        with open(part_path, "w", encoding="utf-8") as f:
+            for i in range(start, end):
+                f.write(doc[i].get_text())
+    return None
+
+
+def layout_docx_segment(input_path: str, page_numbers: List[int], json_path: str) -> float:
+    """
+    Lay out a segment of pages with pdf2docx and serialize the parsed pages to json_path.
+    Runs in a worker process.
+
+    Returns:
+        float: Seconds spent on the segment.
+    """
+    started = time.perf_counter()
+    cv = Pdf2DocxConverter(input_path)
+    try:
+        cv.load_pages()
+        for page in cv.pages:
+            page.skip_parsing = True
+        for number in page_numbers:
+            cv.pages[number].skip_parsing = False
+        options = cv.default_settings
+        cv.parse_document(**options).parse_pages(**options).serialize(json_path)
+    finally:
+        cv.close()
+    return time.perf_counter() - started
 
 
 class PdfConverter(BaseConverter):
@@ -13,11 +126,13 @@ class PdfConverter(BaseConverter):
     Supports conversion to DOCX, PNG, TXT, and MD.
     """
 
+    workload = Workload.CPU
+
     @classmethod
     def supported_source_formats(cls) -> list[str]:
         return [".pdf"]
 
-    @property
+    @cached_property
     def meta(self) -> ConverterMeta:
         return ConverterMeta(
             name="pdf-converter",
@@ -26,20 +141,20 @@ class PdfConverter(BaseConverter):
             supported_targets=[".docx", ".png", ".txt", ".md"],
         )
 
-    async def convert(self, input_path: str, output_path: str, target_format: str, **kwargs: Any) -> str:
+    def convert_sync(self, input_path: str, output_path: str, target_format: str, **kwargs: Any) -> str:
         """
-        Convert PDF to specified format.
+        Convert PDF to specified format. Runs inside the CPU executor pool.
         """
-        if target_format not in self.meta.supported_targets:
+        if not self.meta.supports(target_format):
             raise ValueError(f"Target format {target_format} is not supported by {self.meta.name}")
 
         try:
             if target_format == ".docx":
-                return self._convert_to_docx(input_path, output_path)
+                return self._convert_to_docx(input_path, output_path, **kwargs)
             elif target_format == ".png":
-                return self._convert_to_png(input_path, output_path)
+                return self._convert_to_png(input_path, output_path, **kwargs)
             elif target_format in [".txt", ".md"]:
-                return self._convert_to_text(input_path, output_path, target_format)
+                return self._convert_to_text(input_path, output_path, target_format, **kwargs)
             else:
                 raise ValueError(f"Unimplemented format: {target_format}")
 
@@ -47,35 +162,297 @@ class PdfConverter(BaseConverter):
             logger.error(f"Error converting PDF {input_path} to {target_format}: {e}")
             raise e
 
-    def _convert_to_docx(self, input_path: str, output_path: str) -> str:
-        cv = Pdf2DocxConverter(input_path)
-        cv.convert(output_path, start=0, end=None)
-        cv.close()
+    def convert_many_sync(self, input_path: str, outputs: Dict[str, str], **kwargs: Any) -> Dict[str, str]:
+        """
+        Convert PDF to several formats from one opened document. Runs inside the CPU executor pool.
+
+        DOCX layout runs in its own child processes, so it is started first and
+        overlaps with the other targets, which share this document handle. When
+        both TXT and MD are requested the text is extracted only once.
+        """
+        for target_format in outputs:
+            if not self.meta.supports(target_format):
+                raise ValueError(f"Target format {target_format} is not supported by {self.meta.name}")
+
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=1) as docx_runner, fitz.open(input_path) as doc:
+                docx_future = None
+                if ".docx" in outputs:
+                    docx_future = docx_runner.submit(self._convert_to_docx, input_path, outputs[".docx"], **kwargs)
+
+                if ".png" in outputs:
+                    results[".png"] = self._convert_to_png(input_path, outputs[".png"], doc=doc, **kwargs)
+
+                text_formats = [fmt for fmt in (".txt", ".md") if fmt in outputs]
+                if text_formats:
+                    first = text_formats[0]
+                    results[first] = self._convert_to_text(input_path, outputs[first], first, doc=doc, **kwargs)
+                    if len(text_formats) == 2:
+                        results[".md"] = self._text_to_markdown(results[".txt"], outputs[".md"])
+
+                if docx_future:
+                    results[".docx"] = docx_future.result()
+        except Exception as e:
+            logger.error(f"Error converting PDF {input_path} to {list(outputs)}: {e}")
+            raise e
+
+        return results
+
+    def _convert_to_docx(self, input_path: str, output_path: str, pages: Any = "all", **kwargs: Any) -> str:
+        """
+        Convert the selected pages to DOCX.
+
+        Page layout runs in child processes that are killed once PDF_DOCX_TIMEOUT
+        expires. Documents with at least PDF_DOCX_PARALLEL_MIN_PAGES pages are split
+        into one contiguous segment per worker; smaller ones use a single process.
+        Each segment serializes its parsed pages to a private directory and the
+        DOCX is assembled from them here, in page order.
+
+        Args:
+            pages: 1-based page selection, e.g. "1-3,7". Defaults to all pages.
+
+        Raises:
+            TimeoutError: If the layout does not finish in time.
+        """
+        with fitz.open(input_path) as doc:
+            numbers = parse_page_range(pages, doc.page_count)
+
+        workers = settings.PDF_DOCX_WORKERS or os.cpu_count() or 1
+        if len(numbers) < settings.PDF_DOCX_PARALLEL_MIN_PAGES:
+            workers = 1
+        workers = min(workers, len(numbers))
+        segment_size = -(-len(numbers) // workers)
+        segments = [numbers[i:i + segment_size] for i in range(0, len(numbers), segment_size)]
+
+        json_dir = tempfile.mkdtemp(prefix="docx-", dir=os.path.dirname(output_path) or None)
+        json_paths = [os.path.join(json_dir, f"segment-{i}.json") for i in range(len(segments))]
+        started = time.perf_counter()
+        try:
+            timings = self._layout_segments(input_path, segments, json_paths)
+
+            cv = Pdf2DocxConverter(input_path)
+            try:
+                for json_path in json_paths:
+                    cv.deserialize(json_path)
+                cv.make_docx(output_path, **cv.default_settings)
+            finally:
+                cv.close()
+        finally:
+            shutil.rmtree(json_dir, ignore_errors=True)
+
+        elapsed = time.perf_counter() - started
+        slowest = max(t / len(segment) for t, segment in zip(timings, segments))
+        logger.info(
+            f"Converted {len(numbers)} pages of {input_path} to DOCX in {elapsed:.2f}s "
+            f"({len(segments)} segments, {elapsed / len(numbers):.3f}s/page, slowest segment {slowest:.3f}s/page)"
+        )
         return output_path
 
-    def _convert_to_png(self, input_path: str, output_path: str) -> str:
-        # For MVP, only convert the first page to an image
-        doc = fitz.open(input_path)
-        page = doc[0]  # first page
-        pix = page.get_pixmap()
-        pix.save(output_path)
-        doc.close()
+    @staticmethod
+    def _layout_segments(input_path: str, segments: List[List[int]], json_paths: List[str]) -> List[float]:
+        """
+        Lay out every segment in its own child process, bounded by PDF_DOCX_TIMEOUT.
+        Inside a daemonic worker process, which cannot have children, segments run inline.
+        """
+        if multiprocessing.current_process().daemon:
+            return [layout_docx_segment(input_path, s, p) for s, p in zip(segments, json_paths)]
+
+        # Never fork the threaded server: a lock held by another thread would stay locked in the child
+        pool = multiprocessing.get_context("forkserver").Pool(processes=len(segments))
+        try:
+            result = pool.starmap_async(
+                layout_docx_segment,
+                [(input_path, segment, json_path) for segment, json_path in zip(segments, json_paths)],
+            )
+            try:
+                return result.get(timeout=settings.PDF_DOCX_TIMEOUT)
+            except multiprocessing.TimeoutError:
+                raise TimeoutError(f"PDF to DOCX layout exceeded {settings.PDF_DOCX_TIMEOUT}s")
+        finally:
+            # Kills any segment still running
+            pool.terminate()
+            pool.join()
+
+    def _convert_to_png(
+        self,
+        input_path: str,
+        output_path: str,
+        pages: Any = "1",
+        dpi: Optional[int] = None,
+        scale: Optional[float] = None,
+        doc: Optional[fitz.Document] = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Render the selected pages to PNG.
+
+        A single page is written to `output_path`. Several pages are rendered in
+        parallel worker processes and collected, in page order, into a ZIP archive
+        next to it. At most PDF_RENDER_MAX_INFLIGHT batches are rendered at once,
+        each holding a single pixmap, which bounds memory for huge documents.
+
+        Args:
+            pages: 1-based page selection, e.g. "1-3,7" or "all". Defaults to the first page.
+            dpi (int, optional): Output resolution. Defaults to 72 (PDF points).
+            scale (float, optional): Zoom factor, alternative to dpi.
+            doc (fitz.Document, optional): Already opened source document.
+
+        Returns:
+            str: Path of the PNG, or of the ZIP archive for multiple pages.
+        """
+        zoom = self._zoom(dpi, scale)
+        with self._open(input_path, doc) as doc:
+            numbers = parse_page_range(pages, doc.page_count)
+            if len(numbers) == 1:
+                doc[numbers[0]].get_pixmap(matrix=fitz.Matrix(zoom, zoom)).save(output_path)
+                return output_path
+
+        zip_path = os.path.splitext(output_path)[0] + ".zip"
+        pages_dir = f"{output_path}.pages"
+        os.makedirs(pages_dir, exist_ok=True)
+
+        batch_size = settings.PDF_RENDER_BATCH_PAGES
+        batches = [numbers[i:i + batch_size] for i in range(0, len(numbers), batch_size)]
+        pool = get_executor_pool().process_pool() if len(batches) > 1 else None
+        logger.info(f"Rendering {len(numbers)} pages of {input_path} at zoom {zoom:.2f} ({len(batches)} batches)")
+
+        try:
+            # PNG data is already compressed
+            with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as archive:
+                if pool is None:
+                    for batch in batches:
+                        self._archive_pages(archive, render_pages(input_path, batch, zoom, pages_dir))
+                else:
+                    in_flight = deque()
+                    for batch in batches:
+                        if len(in_flight) >= settings.PDF_RENDER_MAX_INFLIGHT:
+                            self._archive_pages(archive, in_flight.popleft().result())
+                        in_flight.append(pool.submit(render_pages, input_path, batch, zoom, pages_dir))
+                    while in_flight:
+                        self._archive_pages(archive, in_flight.popleft().result())
+        except Exception:
+            if os.path.exists(zip_path):
+                os.remove(zip_path)
+            raise
+        finally:
+            shutil.rmtree(pages_dir, ignore_errors=True)
+
+        return zip_path
+
+    @staticmethod
+    def _open(input_path: str, doc: Optional[fitz.Document]):
+        """
+        Open the source document, unless the caller already holds it open.
+        """
+        return nullcontext(doc) if doc is not None else fitz.open(input_path)
+
+    @staticmethod
+    def _zoom(dpi: Optional[int], scale: Optional[float]) -> float:
+        if dpi is not None:
+            dpi = int(dpi)
+            if not 1 <= dpi <= settings.PDF_MAX_DPI:
+                raise ValueError(f"DPI must be between 1 and {settings.PDF_MAX_DPI}")
+            return dpi / 72
+        if scale is not None:
+            scale = float(scale)
+            if not 0 < scale <= settings.PDF_MAX_DPI / 72:
+                raise ValueError(f"Scale must be between 0 and {settings.PDF_MAX_DPI / 72:.2f}")
+            return scale
+        return 1.0
+
+    @staticmethod
+    def _archive_pages(archive: zipfile.ZipFile, paths: List[str]):
+        """
+        Move rendered pages into the archive, deleting the files as they are added.
+        """
+        for path in paths:
+            archive.write(path, arcname=os.path.basename(path))
+            os.remove(path)
+
+    def _convert_to_text(
+        self,
+        input_path: str,
+        output_path: str,
+        target_format: str,
+        stream_pages: bool = True,
+        parallel_min_pages: Optional[int] = None,
+        shard_pages: Optional[int] = None,
+        doc: Optional[fitz.Document] = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Extract the text of every page into the output file, in page order.
+
+        Large documents are split into page shards extracted in parallel worker
+        processes. With `stream_pages` each shard is spooled to a part file and
+        appended to the output, so the full text is never held in memory.
+        """
+        parallel_min_pages = parallel_min_pages or settings.PDF_PARALLEL_MIN_PAGES
+        shard_pages = shard_pages or settings.PDF_SHARD_PAGES
+
+        with self._open(input_path, doc) as doc:
+            page_count = doc.page_count
+            pool = get_executor_pool().process_pool() if page_count >= parallel_min_pages else None
+
+            with open(output_path, "w", encoding="utf-8") as out:
+                # Wrap in markdown code block if MD is requested, or just raw text
+                if target_format == ".md":
+                    out.write(MD_TEXT_HEADER)
+
+                if pool is None:
+                    for page in doc:
+                        out.write(page.get_text())
+                else:
+                    self._extract_text_parallel(pool, input_path, output_path, out, page_count, shard_pages, stream_pages)
+
+                if target_format == ".md":
+                    out.write(MD_TEXT_FOOTER)
+
         return output_path
 
-    def _convert_to_text(self, input_path: str, output_path: str, target_format: str) -> str:
-        doc = fitz.open(input_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        
-        doc.close()
-
-        # Wrap in markdown code block if MD is requested, or just raw text
-        content = text
-        if target_format == ".md":
-             content = f"# Extracted Text\n\n```text\n{text}\n```"
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        
+    @staticmethod
+    def _text_to_markdown(text_path: str, output_path: str) -> str:
+        """
+        Wrap already extracted text into the markdown output.
+        """
+        with open(text_path, "r", encoding="utf-8") as src, open(output_path, "w", encoding="utf-8") as out:
+            out.write(MD_TEXT_HEADER)
+            shutil.copyfileobj(src, out)
+            out.write(MD_TEXT_FOOTER)
         return output_path
+
+    def _extract_text_parallel(
+        self,
+        pool: Executor,
+        input_path: str,
+        output_path: str,
+        out: TextIO,
+        page_count: int,
+        shard_pages: int,
+        stream_pages: bool,
+    ):
+        shards = page_shards(page_count, shard_pages)
+        logger.info(f"Extracting {page_count} pages of {input_path} in {len(shards)} parallel shards")
+
+        part_paths = [f"{output_path}.part{i}" if stream_pages else None for i in range(len(shards))]
+        futures = [
+            pool.submit(extract_text_shard, input_path, start, end, part_path)
+            for (start, end), part_path in zip(shards, part_paths)
+        ]
+        try:
+            # Shards finish in any order but are appended in page order
+            for future, part_path in zip(futures, part_paths):
+                text = future.result()
+                if part_path is None:
+                    out.write(text)
+                else:
+                    with open(part_path, "r", encoding="utf-8") as part:
+                        shutil.copyfileobj(part, out)
+                    os.remove(part_path)
+        finally:
+            for future in futures:
+                future.cancel()
+            for part_path in part_paths:
+                if part_path and os.path.exists(part_path):
+                    os.remove(part_path)
@@ -1,20 +1,127 @@
 import asyncio
 import os
-from app.plugins.base import BaseConverter, ConverterMeta
+import shutil
+import tempfile
+import time
+from functools import cached_property
+from typing import List, Optional, Tuple
+from app.plugins.base import BaseConverter, ConverterMeta, Workload
+from app.core.config import get_settings
+from app.core.ffmpeg import (
+    PROGRESS_ARGS, MediaInfo, StreamInfo, probe_keyframes, probe_media, run_ffmpeg,
+)
 from app.core.logger import logger
+from app.core.progress import report_progress
+from app.core.report import report_detail
+from app.core.subprocess_runner import get_resource_limits
+
+settings = get_settings()
+
+# Codecs each target container can hold as they are, by stream type
+CONTAINER_CODECS = {
+    "mkv": {
+        "video": {"h264", "hevc", "vp8", "vp9", "av1", "mpeg4", "mpeg2video", "mjpeg", "theora"},
+        "audio": {"aac", "mp3", "opus", "vorbis", "flac", "ac3", "eac3", "dts", "alac", "pcm_s16le", "pcm_s24le"},
+        "subtitle": {"subrip", "ass", "ssa", "webvtt", "hdmv_pgs_subtitle", "dvd_subtitle"},
+    },
+    "avi": {
+        "video": {"mpeg4", "msmpeg4v2", "msmpeg4v3", "mjpeg"},
+        "audio": {"mp3", "ac3", "pcm_s16le"},
+    },
+    "mp3": {"audio": {"mp3"}},
+    "wav": {"audio": {"pcm_s16le", "pcm_s24le", "pcm_f32le"}},
+}
+# Encoders for streams that cannot be copied; stream types missing here are dropped
+REENCODE_CODECS = {
+    "mkv": {"video": "libx264", "audio": "aac", "subtitle": "srt"},
+    "avi": {"video": "mpeg4", "audio": "libmp3lame"},
+    "mp3": {"audio": "libmp3lame"},
+    "wav": {"audio": "pcm_s16le"},
+}
+# Targets keeping only the first audio stream
+AUDIO_TARGETS = {"mp3", "wav"}
+# Targets whose transcode can be split into segments and concatenated with stream copy
+SEGMENT_TARGETS = {"mkv", "avi"}
+
+
+def plan_stream_copy(streams: List[StreamInfo], target_ext: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Decide which streams can be copied into the target container without re-encoding.
+
+    Returns:
+        Tuple[str, List[str]], optional: The strategy ("remux" when every stream is
+            copied, "partial" when only some are) and the -map/-c arguments, or None
+            if nothing can be copied and a full transcode is needed.
+    """
+    allowed = CONTAINER_CODECS.get(target_ext)
+    if not allowed:
+        return None
+    encoders = REENCODE_CODECS[target_ext]
+
+    selected = [stream for stream in streams if stream.codec_type in encoders]
+    if target_ext in AUDIO_TARGETS:
+        selected = selected[:1]
+
+    args: List[str] = []
+    copied = 0
+    for out_index, stream in enumerate(selected):
+        args.extend(["-map", f"0:{stream.index}"])
+        if stream.codec_name in allowed.get(stream.codec_type, ()):
+            args.extend([f"-c:{out_index}", "copy"])
+            copied += 1
+        else:
+            args.extend([f"-c:{out_index}", encoders[stream.codec_type]])
+
+    if copied == 0:
+        return None
+    return ("remux" if copied == len(selected) else "partial"), args
+
+
+def segment_bounds(keyframes: List[float], duration: float, count: int) -> List[Tuple[float, Optional[float]]]:
+    """
+    Cut a video into at most `count` segments of similar length, each starting
+    on a keyframe so it can be transcoded on its own.
+
+    Args:
+        keyframes (List[float]): Keyframe timestamps in seconds, in order.
+        duration (float): Total duration in seconds.
+        count (int): Wanted number of segments.
+
+    Returns:
+        List[Tuple[float, Optional[float]]]: (start, end) offsets from the first
+            keyframe; the last segment's end is None (to the end of the input).
+    """
+    if not keyframes or count < 2:
+        return [(0.0, None)]
+    # Input seeking is relative to the start of the file, packet timestamps are not
+    origin = keyframes[0]
+    offsets = [k - origin for k in keyframes]
+
+    cuts = [0.0]
+    for i in range(1, count):
+        target = duration * i / count
+        cut = next((k for k in offsets if k >= target), None)
+        if cut is None or cut >= duration:
+            break
+        if cut > cuts[-1]:
+            cuts.append(cut)
+    return [(start, end) for start, end in zip(cuts, cuts[1:] + [None])]
+
 
 class VideoConverter(BaseConverter):
     """
     Converter for video files using FFmpeg.
     """
 
-    @property
+    workload = Workload.SUBPROCESS
+
+    @cached_property
     def meta(self) -> ConverterMeta:
         return ConverterMeta(
             name="video-converter",
             description="Converts video files using FFmpeg.",
             source_format=".mp4",  # Dynamic registration will handle others
-            supported_targets=["mp3", "gif", "wav", "mkv", "avi"]
+            supported_targets=[".mp3", ".gif", ".wav", ".mkv", ".avi"]
         )
 
     def __init__(self, source_format: str = ".mp4"):
@@ -24,48 +131,174 @@ class VideoConverter(BaseConverter):
     def supported_source_formats(cls) -> list[str]:
         return [".mp4", ".avi", ".mov", ".mkv"]
 
-    async def convert(self, input_path: str, output_path: str, target_format: str, **kwargs) -> str:
+    async def convert(
+        self, input_path: str, output_path: str, target_format: str, remux: bool = True, **kwargs
+    ) -> str:
         """
         Convert video using ffmpeg subprocess.
+        Progress (percent, speed, ETA) is published while ffmpeg runs.
+
+        Streams whose codecs the target container accepts are copied instead of
+        re-encoded (unless `remux` is False). The chosen strategy ("remux",
+        "partial" or "transcode") is reported as a conversion detail.
+        Long video transcodes may be split into segments, see `_convert_segments`.
         """
         # Ensure target format is clean (no dot for ffmpeg check usually, but output_path has it)
         # target_format coming in has dot, e.g. ".mp3"
         
         target_ext = target_format.lower().lstrip(".")
-        
+
+        media = await probe_media(input_path, settings.FFPROBE_BINARY, settings.FFPROBE_TIMEOUT)
+        duration = media.duration if media else None
+        plan = plan_stream_copy(media.streams, target_ext) if media and remux else None
+
         # Build command based on target
         # Default generic conversion
-        args = ["-i", input_path]
+        codec_args = []
+
+        if plan:
+            codec_args.extend(plan[1])
 
-        if target_ext == "mp3":
+        elif target_ext == "mp3":
             # Extract audio: -vn (no video), -acodec libmp3lame
-            args.extend(["-vn", "-acodec", "libmp3lame"])
+            codec_args.extend(["-vn", "-acodec", "libmp3lame"])
         
         elif target_ext == "gif":
             # Create GIF: scale and fps
             # example: -vf "fps=10,scale=320:-1:flags=lanczos"
-            args.extend(["-vf", "fps=10,scale=320:-1:flags=lanczos"])
+            codec_args.extend(["-vf", "fps=10,scale=320:-1:flags=lanczos"])
         
         # For wav, mkv, avi we typically just let ffmpeg handle auto-detection or copy codecs if appropriate.
         # But simple re-encoding is safer for compatibility.
+        strategy = plan[0] if plan else "transcode"
+        report_detail("strategy", strategy)
+        report_progress(status="running", duration=duration, percent=0.0 if duration else None)
+
+        if self._should_segment(media, target_ext, plan):
+            bounds = segment_bounds(
+                await probe_keyframes(input_path, settings.FFPROBE_BINARY, settings.FFPROBE_TIMEOUT),
+                duration,
+                settings.VIDEO_SEGMENT_WORKERS or os.cpu_count() or 1,
+            )
+            if len(bounds) > 1:
+                await self._convert_segments(input_path, output_path, codec_args, bounds, duration)
+                return output_path
+
         # We also need 'y' to overwrite if it exists (though service usually handles path uniqueness, ffmpeg prompts without -y)
-        args.append("-y") 
-        args.append(output_path)
+        args = ["-i", input_path, *codec_args, *PROGRESS_ARGS, "-y", output_path]
 
         logger.info(f"Running ffmpeg: ffmpeg {' '.join(args)}")
-
-        process = await asyncio.create_subprocess_exec(
-            "ffmpeg",
-            *args,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+        await run_ffmpeg(
+            args,
+            settings.FFMPEG_BINARY,
+            duration=duration,
+            on_progress=lambda fields: report_progress(**fields),
+            stderr_lines=settings.FFMPEG_STDERR_LINES,
+            timeout=settings.FFMPEG_TIMEOUT,
+            limits=get_resource_limits(),
         )
 
-        stdout, stderr = await process.communicate()
+        return output_path
 
-        if process.returncode != 0:
-            error_msg = stderr.decode().strip()
-            logger.error(f"FFmpeg failed: {error_msg}")
-            raise RuntimeError(f"Video conversion failed: {error_msg}")
+    @staticmethod
+    def _should_segment(media: Optional[MediaInfo], target_ext: str, plan) -> bool:
+        """
+        Whether a conversion is worth splitting: a long enough input whose video is re-encoded.
+        """
+        if settings.VIDEO_SEGMENT_MIN_DURATION is None or target_ext not in SEGMENT_TARGETS:
+            return False
+        if not media or not media.duration or media.duration < settings.VIDEO_SEGMENT_MIN_DURATION:
+            return False
+        copied = CONTAINER_CODECS[target_ext]["video"] if plan else set()
+        return any(s.codec_type == "video" and s.codec_name not in copied for s in media.streams)
 
-        return output_path
+    async def _convert_segments(
+        self,
+        input_path: str,
+        output_path: str,
+        codec_args: List[str],
+        bounds: List[Tuple[float, Optional[float]]],
+        duration: float,
+    ):
+        """
+        Transcode each segment in its own ffmpeg process, then concatenate the
+        segments with stream copy. Progress is the sum over all segments.
+
+        Raises:
+            RuntimeError: If any segment or the concatenation fails; the other
+                segments are stopped.
+        """
+        report_detail("segments", str(len(bounds)))
+        # Share the cores between the segments instead of letting every encoder use them all
+        threads = max(1, (os.cpu_count() or 1) // len(bounds))
+        _, ext = os.path.splitext(output_path)
+        segment_dir = tempfile.mkdtemp(prefix="segments-", dir=os.path.dirname(output_path) or None)
+        segment_paths = [os.path.join(segment_dir, f"segment-{i}{ext}") for i in range(len(bounds))]
+
+        out_times = [0.0] * len(bounds)
+        speeds = [0.0] * len(bounds)
+
+        def on_progress(index: int, fields: dict):
+            out_times[index] = fields["out_time"] or out_times[index]
+            speeds[index] = 0.0 if fields["eta"] == 0.0 else (fields["speed"] or 0.0)
+            done = sum(out_times)
+            speed = sum(speeds)
+            report_progress(
+                out_time=done,
+                speed=round(speed, 2) or None,
+                fps=fields["fps"],
+                percent=round(min(100.0, done / duration * 100), 2),
+                eta=round(max(0.0, duration - done) / speed, 2) if speed else None,
+            )
+
+        def segment_args(index: int) -> List[str]:
+            start, end = bounds[index]
+            length = ["-t", f"{end - start:.6f}"] if end is not None else []
+            return [
+                "-ss", f"{start:.6f}", "-i", input_path, *length, *codec_args,
+                "-threads", str(threads), *PROGRESS_ARGS, "-y", segment_paths[index],
+            ]
+
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(run_ffmpeg(
+                segment_args(i),
+                settings.FFMPEG_BINARY,
+                duration=(end or duration) - start,
+                on_progress=lambda fields, i=i: on_progress(i, fields),
+                stderr_lines=settings.FFMPEG_STDERR_LINES,
+                timeout=settings.FFMPEG_TIMEOUT,
+                limits=get_resource_limits(),
+            ))
+            for i, (start, end) in enumerate(bounds)
+        ]
+        try:
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+            list_path = os.path.join(segment_dir, "segments.txt")
+            with open(list_path, "w", encoding="utf-8") as f:
+                for path in segment_paths:
+                    escaped = path.replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            await run_ffmpeg(
+                ["-f", "concat", "-safe", "0", "-i", list_path, "-map", "0", "-c", "copy",
+                 *PROGRESS_ARGS, "-y", output_path],
+                settings.FFMPEG_BINARY,
+                stderr_lines=settings.FFMPEG_STDERR_LINES,
+                timeout=settings.FFMPEG_TIMEOUT,
+                limits=get_resource_limits(),
+            )
+        finally:
+            shutil.rmtree(segment_dir, ignore_errors=True)
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Transcoded {duration:.1f}s of video in {len(bounds)} segments in {elapsed:.2f}s "
+            f"({duration / elapsed:.2f}x realtime)"
+        )
@@ -0,0 +1,148 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from fastapi import HTTPException
+from loguru import logger
+
+
+class PluginLimiter:
+    """
+    Concurrency limit and bounded wait queue for a single plugin.
+
+    Tracks an exponentially weighted moving average of the observed service
+    time, used to estimate when a rejected client should retry.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, initial_service_time: float = 1.0):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.active = 0
+        self.service_time = initial_service_time
+        self.rejected = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """
+        Estimated seconds until a slot frees up for a newly arriving request.
+        """
+        return max(1, math.ceil(self.service_time * (self.waiting + 1) / self.limit))
+
+    async def acquire(self, reject_when_busy: bool = True):
+        """
+        Take a slot, waiting in the queue if all slots are busy.
+
+        Raises:
+            HTTPException: 429 with a Retry-After header if the queue is full.
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return
+
+        if reject_when_busy and self.waiting >= self.max_queue:
+            self.rejected += 1
+            retry_after = self.retry_after()
+            logger.warning(f"Rejecting {self.name} conversion: {self.active} running, {self.waiting} queued")
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many {self.name} conversions in progress, retry in {retry_after}s",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            # The slot is handed over by release() without touching `active`
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Got the slot just as we were cancelled; pass it on
+                self.release()
+            else:
+                self._waiters.remove(future)
+            raise
+
+    def release(self, elapsed: Optional[float] = None, alpha: float = 0.2):
+        """
+        Free a slot, handing it to the next waiter if there is one.
+        """
+        if elapsed is not None:
+            self.service_time = (1 - alpha) * self.service_time + alpha * elapsed
+
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionController:
+    """
+    Per-plugin admission control.
+
+    Each plugin gets its own concurrency limit and wait queue so that a burst of
+    heavy conversions (video, office) cannot starve cheap ones.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        queue_limits: Optional[Dict[str, int]] = None,
+        default_limit: int = 8,
+        default_queue_limit: int = 16,
+    ):
+        self._limits = limits or {}
+        self._queue_limits = queue_limits or {}
+        self._default_limit = default_limit
+        self._default_queue_limit = default_queue_limit
+        self._limiters: Dict[str, PluginLimiter] = {}
+
+    def get_limiter(self, name: str) -> PluginLimiter:
+        limiter = self._limiters.get(name)
+        if limiter is None:
+            limiter = PluginLimiter(
+                name,
+                self._limits.get(name, self._default_limit),
+                self._queue_limits.get(name, self._default_queue_limit),
+            )
+            self._limiters[name] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def admit(self, name: str, reject_when_busy: bool = True) -> AsyncIterator[PluginLimiter]:
+        """
+        Hold a slot of the given plugin for the duration of the block.
+
+        Args:
+            name (str): Plugin name.
+            reject_when_busy (bool): Fail fast with 429 when the wait queue is full.
+                Callers with their own bounded queue (the job scheduler) pass False.
+        """
+        limiter = self.get_limiter(name)
+        await limiter.acquire(reject_when_busy)
+        start = time.perf_counter()
+        try:
+            yield limiter
+        finally:
+            limiter.release(time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                "limit": limiter.limit,
+                "active": limiter.active,
+                "waiting": limiter.waiting,
+                "rejected": limiter.rejected,
+                "service_time": round(limiter.service_time, 3),
+            }
+            for name, limiter in self._limiters.items()
+        }
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+
+from loguru import logger
+
+
+class CacheEntry(NamedTuple):
+    path: str
+    size: int
+
+
+class ResultCache:
+    """
+    Content-addressed, size-bounded disk cache for conversion outputs.
+
+    Entries are keyed by the hash of the input bytes, the plugin name, the target
+    format and the conversion options. The least recently used entries are evicted
+    once the total size exceeds the byte budget.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self._cache_dir = os.path.abspath(cache_dir)
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(content_hash: str, plugin_name: str, target_format: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a conversion.
+
+        Args:
+            content_hash (str): Hex digest of the input bytes.
+            plugin_name (str): Name of the plugin performing the conversion.
+            target_format (str): Target format extension.
+            options (dict, optional): Conversion options affecting the output.
+
+        Returns:
+            str: Hex digest identifying the conversion result.
+        """
+        payload = json.dumps(
+            [content_hash, plugin_name, target_format.lower().lstrip("."), options or {}],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_index(self):
+        """
+        Rebuild the in-memory index from files left by a previous run, oldest first.
+        """
+        found = []
+        for name in os.listdir(self._cache_dir):
+            path = os.path.join(self._cache_dir, name)
+            if name.endswith(".tmp"):
+                # Interrupted write
+                os.remove(path)
+            elif os.path.isfile(path):
+                stat = os.stat(path)
+                found.append((stat.st_mtime, os.path.splitext(name)[0], CacheEntry(path, stat.st_size)))
+
+        for _, key, entry in sorted(found):
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+        self._evict()
+
+        if found:
+            logger.info(f"Loaded {len(self._entries)} cached results ({self._total_bytes} bytes)")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached result and mark it as recently used.
+
+        Returns:
+            str, optional: Path of the cached output, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry and not os.path.exists(entry.path):
+            # Removed behind our back
+            self._drop(key)
+            entry = None
+
+        if not entry:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        os.utime(entry.path)
+        return entry.path
+
+    def put(self, key: str, output_path: str) -> Optional[str]:
+        """
+        Store a conversion output. The file is hard-linked when possible, copied otherwise,
+        so the caller remains free to delete `output_path`.
+
+        Returns:
+            str, optional: Path of the cached copy, or None if the output exceeds the budget.
+        """
+        size = os.path.getsize(output_path)
+        if size > self._max_bytes:
+            logger.debug(f"Not caching {output_path}: {size} bytes exceeds cache budget")
+            return None
+
+        _, ext = os.path.splitext(output_path)
+        cache_path = os.path.join(self._cache_dir, f"{key}{ext}")
+        if key in self._entries:
+            self._drop(key)
+
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            os.link(output_path, tmp_path)
+        except OSError:
+            shutil.copyfile(output_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+
+        self._entries[key] = CacheEntry(cache_path, size)
+        self._total_bytes += size
+        self._evict()
+        return cache_path
+
+    def _drop(self, key: str):
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """
+        Remove least recently used entries until the cache fits its byte budget.
+        """
+        while self._total_bytes > self._max_bytes and self._entries:
+            key = next(iter(self._entries))
+            logger.debug(f"Evicting cached result {key}")
+            self._drop(key)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._total_bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
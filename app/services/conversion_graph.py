@@ -0,0 +1,135 @@
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+from app.core.executor import Workload
+from app.plugins.base import ConverterMeta, normalize_format
+
+# Seconds assumed for an edge until a conversion over it has been measured
+DEFAULT_EDGE_COSTS: Dict[Workload, float] = {
+    Workload.IO: 0.5,
+    Workload.CPU: 2.0,
+    Workload.SUBPROCESS: 5.0,
+}
+
+
+class Edge(BaseModel):
+    """
+    A direct conversion offered by a plugin.
+
+    Attributes:
+        source (str): Normalized source extension.
+        target (str): Normalized target extension.
+        plugin (str): Name of the plugin performing the conversion.
+        cost (float): Estimated seconds per conversion (moving average once measured).
+        samples (int): Number of measured conversions.
+    """
+    source: str
+    target: str
+    plugin: str
+    cost: float
+    samples: int = 0
+
+
+class ConversionGraph:
+    """
+    Graph of formats connected by the direct conversions of the registered plugins.
+
+    Conversions without a direct plugin are routed over the cheapest chain of
+    edges, e.g. DOCX -> PDF -> PNG. Edge costs start from a per-workload guess
+    and follow the measured conversion times.
+
+    Direct conversions are dispatched from a (source, target) table. Routes are
+    computed per source on first use and kept until an edge cost changes.
+    """
+
+    def __init__(self, max_hops: int = 3, alpha: float = 0.2):
+        self.max_hops = max_hops
+        self.alpha = alpha
+        self._edges: Dict[str, Dict[str, Edge]] = {}
+        self._direct: Dict[Tuple[str, str], Edge] = {}
+        self._routes: Dict[str, Dict[str, Tuple[float, List[Edge]]]] = {}
+
+    def add_plugin(self, source_format: str, meta: ConverterMeta, workload: Workload):
+        """
+        Add an edge for every target of a plugin registered for `source_format`.
+        """
+        source = normalize_format(source_format)
+        cost = DEFAULT_EDGE_COSTS.get(workload, DEFAULT_EDGE_COSTS[Workload.CPU])
+        edges = self._edges.setdefault(source, {})
+        for target_format in meta.supported_targets:
+            target = normalize_format(target_format)
+            edges[target] = self._direct[(source, target)] = Edge(
+                source=source, target=target, plugin=meta.name, cost=cost
+            )
+        self._routes.clear()
+
+    def record(self, edge: Edge, elapsed: float):
+        """
+        Fold a measured conversion time into the edge cost.
+        """
+        if edge.samples == 0:
+            edge.cost = elapsed
+        else:
+            edge.cost = (1 - self.alpha) * edge.cost + self.alpha * elapsed
+        edge.samples += 1
+        self._routes.clear()
+
+    def find_path(self, source_format: str, target_format: str) -> Optional[List[Edge]]:
+        """
+        Find the conversion chain for a target: the direct edge if a plugin offers
+        one, else the cheapest chain of at most `max_hops` conversions.
+
+        Returns:
+            List[Edge], optional: The edges in order, or None if the target is unreachable.
+        """
+        source, target = normalize_format(source_format), normalize_format(target_format)
+        direct = self._direct.get((source, target))
+        if direct:
+            return [direct]
+        route = self.routes(source).get(target)
+        return route[1] if route else None
+
+    def routes(self, source_format: str) -> Dict[str, Tuple[float, List[Edge]]]:
+        """
+        Cheapest route to every format reachable from `source_format` in at most `max_hops` steps.
+
+        Returns:
+            Dict[str, Tuple[float, List[Edge]]]: Total cost and edges, by normalized target.
+        """
+        source = normalize_format(source_format)
+        cached = self._routes.get(source)
+        if cached is not None:
+            return cached
+
+        best: Dict[str, Tuple[float, List[Edge]]] = {}
+        # Entries are (cost, hops, tie breaker, node, path); states are (node, hops)
+        # so that a cheap long route cannot hide a shorter one that still fits max_hops
+        heap = [(0.0, 0, 0, source, [])]
+        settled = set()
+        counter = 0
+        while heap:
+            cost, hops, _, node, path = heapq.heappop(heap)
+            if (node, hops) in settled:
+                continue
+            settled.add((node, hops))
+            if path and node not in best:
+                # Direct edges are always used when present, whatever their cost;
+                # round trips back to the source format are not routes
+                direct = self._direct.get((source, node))
+                if direct:
+                    best[node] = (direct.cost, [direct])
+                elif node != source:
+                    best[node] = (cost, path)
+            if hops == self.max_hops:
+                continue
+            for edge in self._edges.get(node, {}).values():
+                if (edge.target, hops + 1) not in settled:
+                    counter += 1
+                    heapq.heappush(heap, (cost + edge.cost, hops + 1, counter, edge.target, path + [edge]))
+        self._routes[source] = best
+        return best
+
+    def sources(self) -> List[str]:
+        return list(self._edges)
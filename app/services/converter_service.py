@@ -1,81 +1,86 @@
+import asyncio
+import json
 import os
-from typing import Dict
+import shutil
+import time
+from typing import Any, Dict, List, Optional
 
 from fastapi import HTTPException
 from loguru import logger
 
-import importlib
-import pkgutil
-import inspect
-import app.plugins
-from app.plugins.base import BaseConverter
+from app.core.config import get_settings
+from app.core.executor import ExecutorPool, get_executor_pool
+from app.plugins.base import BaseConverter, ConverterMeta
+from app.services.admission import AdmissionController
+from app.services.conversion_graph import ConversionGraph, Edge
+from app.services.plugin_registry import PluginRegistry
+from app.services.singleflight import SingleFlight
 
 class ConverterService:
     """
     Service to manage file converters and execute conversions.
     """
-    _plugins: Dict[str, BaseConverter]
+    _registry: PluginRegistry
+    _executor: ExecutorPool
+    _flights: SingleFlight
+    _admission: AdmissionController
+    _graph: ConversionGraph
+    _capabilities: Optional[Dict[str, list[str]]]
 
-    def __init__(self):
+    def __init__(self, executor: Optional[ExecutorPool] = None, admission: Optional[AdmissionController] = None):
         """
         Initialize the service and register available plugins.
+
+        Args:
+            executor (ExecutorPool, optional): Pool for blocking plugin work.
+                Defaults to the shared application pool.
+            admission (AdmissionController, optional): Per-plugin concurrency limits.
+                Defaults to the limits configured in Settings.
         """
-        self._plugins = {}
+        settings = get_settings()
+        self._registry = PluginRegistry()
+        self._executor = executor or get_executor_pool()
+        self._flights = SingleFlight()
+        self._admission = admission or AdmissionController(
+            limits=settings.PLUGIN_CONCURRENCY,
+            queue_limits=settings.PLUGIN_QUEUE_LIMITS,
+            default_limit=settings.DEFAULT_PLUGIN_CONCURRENCY,
+            default_queue_limit=settings.DEFAULT_PLUGIN_QUEUE_LIMIT,
+        )
+        self._graph = ConversionGraph(max_hops=settings.CONVERSION_MAX_HOPS)
+        self._capabilities = None
         self._register_plugins()
+        for ext, spec in self._registry.specs().items():
+            self._graph.add_plugin(ext, spec.meta, spec.workload)
 
     def _register_plugins(self):
         """
-        Dynamically register all available converter plugins from app.plugins package.
+        Register all available converter plugins from app.plugins package.
+        Plugin modules are imported on first use, see PluginRegistry.
         """
-        package_path = os.path.dirname(app.plugins.__file__)
-        package_name = app.plugins.__name__
+        self._registry.discover()
 
-        # Iterate over all modules in the app.plugins package
-        for _, name, _ in pkgutil.iter_modules([package_path]):
-            # Skip base module
-            if name == "base":
-                continue
-            
-            try:
-                # Import module
-                module = importlib.import_module(f"{package_name}.{name}")
-                
-                # Inspect module for BaseConverter subclasses
-                for _, obj in inspect.getmembers(module):
-                    if (inspect.isclass(obj) and 
-                        issubclass(obj, BaseConverter) and 
-                        obj is not BaseConverter):
-                        
-                        # Use the new supported_source_formats method
-                        source_formats = obj.supported_source_formats()
-                        
-                        for fmt in source_formats:
-                            # Instantiate with specific source format if the init takes it, 
-                            # or default init if compatible.
-                            # Most our plugins taking 'source_format' in init work fine with this.
-                            try:
-                                # We check signature ?? Or just assume convention.
-                                # Convention: __init__(self, source_format=default) or ()
-                                # If we pass source_format, multi-format plugins work.
-                                # Single format plugins (JsonToMd) don't have source_format in init (implicit).
-                                # We might need to inspect signature.
-                                
-                                sig = inspect.signature(obj.__init__)
-                                if 'source_format' in sig.parameters:
-                                    instance = obj(source_format=fmt)
-                                else:
-                                    instance = obj()
-                                    # Verification: if instance.meta.source_format != fmt...
-                                    # Single source plugins like JsonToMd hardcode source_format in meta.
-                                    # If they claim to support '.json' but strict check fails, that's their bug.
-                                
-                                self._plugins[fmt] = instance
-                                logger.info(f"Registered plugin: {instance.meta.name} for {fmt}")
-                            except Exception as e:
-                                logger.error(f"Failed to instantiate plugin {obj.__name__} for {fmt}: {e}")
-
-            except Exception as e:
-                logger.error(f"Error loading plugin module {name}: {e}")
+    def prewarm(self, names: List[str]):
+        """
+        Import the given plugins (names or source extensions, "*" for all) ahead of their first use.
+        """
+        self._registry.prewarm(names)
+
+    def get_converter_meta(self, filename: str) -> ConverterMeta:
+        """
+        Get the metadata of the converter for a filename without loading the plugin.
+
+        Raises:
+            HTTPException: If no converter is found for the file extension.
+        """
+        _, ext = os.path.splitext(filename)
+        ext = ext.lower()
+
+        spec = self._registry.get_spec(ext)
+        if not spec:
+            logger.warning(f"No converter found for extension: {ext}")
+            raise HTTPException(status_code=400, detail=f"Unsupported file format: {ext}")
+        return spec.meta
 
     def get_converter(self, filename: str) -> BaseConverter:
         """
@@ -90,36 +95,77 @@ class ConverterService:
         Raises:
             HTTPException: If no converter is found for the file extension.
         """
+        self.get_converter_meta(filename)
         _, ext = os.path.splitext(filename)
-        ext = ext.lower()
+        return self._registry.load(ext.lower())
 
-        converter = self._plugins.get(ext)
-        if not converter:
-            logger.warning(f"No converter found for extension: {ext}")
-            raise HTTPException(status_code=400, detail=f"Unsupported file format: {ext}")
-        
-        return converter
+    def get_admission_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get running/queued/rejected counts per plugin.
+        """
+        return self._admission.stats()
 
     def get_supported_conversions(self) -> Dict[str, list[str]]:
         """
         Get a dictionary of all supported source formats and their target formats.
+        Targets only reachable over several conversion steps follow the direct ones.
+        Computed once, since the set of plugins does not change at runtime.
 
         Returns:
             Dict[str, list[str]]: Mapping of source extension to list of target extensions.
         """
-        capabilities = {}
-        for ext, converter in self._plugins.items():
-            capabilities[ext] = converter.meta.supported_targets
-        return capabilities
+        if self._capabilities is None:
+            capabilities = {}
+            for ext, spec in self._registry.specs().items():
+                targets = list(spec.meta.supported_targets)
+                targets.extend(sorted(target for target in self._graph.routes(ext) if not spec.meta.supports(target)))
+                capabilities[ext] = targets
+            self._capabilities = capabilities
+        return self._capabilities
+
+    def get_conversion_costs(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get the estimated cost and conversion steps of every reachable target.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, Any]]]: Mapping of source extension to target
+                extension to {"cost": seconds, "path": formats, "plugins": plugin names}.
+        """
+        costs = {}
+        for ext in self._registry.specs():
+            costs[ext] = {
+                target: {
+                    "cost": round(cost, 3),
+                    "path": [ext] + [edge.target for edge in path],
+                    "plugins": [edge.plugin for edge in path],
+                }
+                for target, (cost, path) in self._graph.routes(ext).items()
+            }
+        return costs
 
-    async def execute_conversion(self, input_path: str, output_dir: str, target_format: str) -> str:
+    async def execute_conversion(
+        self,
+        input_path: str,
+        output_dir: str,
+        target_format: str,
+        options: Optional[Dict[str, Any]] = None,
+        content_hash: Optional[str] = None,
+        reject_when_busy: bool = True,
+    ) -> str:
         """
         Execute the conversion for a given input file.
 
+        When `content_hash` is given, concurrent conversions of identical input
+        with the same target and options are merged into a single execution and
+        every caller receives its own copy of the result.
+
         Args:
             input_path (str): Absolute path to the input file.
             output_dir (str): Directory where the output file should be saved.
             target_format (str): The desired target format extension.
+            options (dict, optional): Plugin-specific conversion options.
+            content_hash (str, optional): Hash of the input bytes, enables deduplication.
+            reject_when_busy (bool): Raise 429 instead of waiting when the plugin's queue is full.
 
         Returns:
             str: Absolute path of the converted output file.
@@ -127,28 +173,146 @@ class ConverterService:
         if not os.path.exists(input_path):
              raise FileNotFoundError(f"Input file not found: {input_path}")
 
+        filename = os.path.basename(input_path)
+        meta = self.get_converter_meta(filename)
+        path = self._find_path(meta, filename, target_format)
+        target_format = path[-1].target
+        base_name, _ = os.path.splitext(filename)
+        output_path = os.path.join(output_dir, f"{base_name}{target_format}")
+        options = options or {}
+
+        async def run() -> str:
+            if len(path) == 1:
+                return await self._run_step(path[0], input_path, output_path, options, reject_when_busy)
+
+            logger.info(f"Routing {input_path} -> {target_format} via {' -> '.join(edge.target for edge in path)}")
+            step_input = input_path
+            intermediates = []
+            try:
+                # Intermediate results stay in the output directory and only the last step gets the options
+                for i, edge in enumerate(path[:-1]):
+                    step_output = os.path.join(output_dir, f"{base_name}.step{i + 1}{edge.target}")
+                    step_input = await self._run_step(edge, step_input, step_output, {}, reject_when_busy)
+                    intermediates.append(step_input)
+                return await self._run_step(path[-1], step_input, output_path, options, reject_when_busy)
+            finally:
+                for intermediate in intermediates:
+                    if os.path.exists(intermediate):
+                        os.remove(intermediate)
+
+        if not content_hash:
+            return await run()
+
+        flight_key = json.dumps([content_hash, meta.name, target_format, options], sort_keys=True, default=str)
+        result_path, shared = await self._flights.do(flight_key, run)
+        if not shared:
+            return result_path
+
+        # Hand the leader's output to this caller under its own name
+        _, result_ext = os.path.splitext(result_path)
+        own_path = os.path.join(output_dir, f"{base_name}{result_ext}")
+        if os.path.abspath(own_path) != os.path.abspath(result_path):
+            self._share_result(result_path, own_path)
+        return own_path
+
+    async def execute_multi_conversion(
+        self,
+        input_path: str,
+        output_dir: str,
+        target_formats: List[str],
+        options: Optional[Dict[str, Any]] = None,
+        reject_when_busy: bool = True,
+    ) -> List[str]:
+        """
+        Convert one input file into several target formats.
+
+        Plugins implementing `convert_many_sync` open and parse the source once
+        for all targets in a single admitted executor call. Other plugins run
+        one conversion per target concurrently.
+
+        Args:
+            input_path (str): Absolute path to the input file.
+            output_dir (str): Directory where the output files should be saved.
+            target_formats (List[str]): The desired target format extensions.
+            options (dict, optional): Plugin-specific conversion options, shared by all targets.
+            reject_when_busy (bool): Raise 429 instead of waiting when the plugin's queue is full.
+
+        Returns:
+            List[str]: Absolute paths of the converted output files, in target order.
+        """
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
         filename = os.path.basename(input_path)
         converter = self.get_converter(filename)
-        
-        # Validate target format
-        if target_format not in converter.meta.supported_targets:
+        options = options or {}
+
+        paths = [self._find_path(converter.meta, filename, target_format) for target_format in target_formats]
+
+        # Targets needing several steps are converted one by one
+        if not converter.converts_many() or any(len(path) > 1 for path in paths):
+            return list(await asyncio.gather(*(
+                self.execute_conversion(input_path, output_dir, target_format, options, reject_when_busy=reject_when_busy)
+                for target_format in target_formats
+            )))
+
+        base_name, _ = os.path.splitext(filename)
+        outputs = {path[0].target: os.path.join(output_dir, f"{base_name}{path[0].target}") for path in paths}
+
+        async with self._admission.admit(converter.meta.name, reject_when_busy):
+            logger.info(f"Starting conversion: {input_path} -> {list(outputs)} using {converter.meta.name}")
+            results = await self._executor.run(
+                converter.workload, converter.convert_many_sync, input_path, outputs, **options
+            )
+        return [results[target_format] for target_format in outputs]
+
+    def _find_path(self, meta: ConverterMeta, filename: str, target_format: str) -> List[Edge]:
+        """
+        Find the conversion steps from a file to a target format.
+
+        Raises:
+            HTTPException: If the target format cannot be reached.
+        """
+        _, ext = os.path.splitext(filename)
+        path = self._graph.find_path(ext.lower(), target_format) if target_format.strip() else None
+        if not path:
             raise HTTPException(
-                status_code=400, 
-                detail=f"Conversion from {converter.meta.source_format} to {target_format} is not supported."
+                status_code=400,
+                detail=f"Conversion from {meta.source_format} to {target_format} is not supported."
             )
+        return path
 
-        # Determine output filename with new extension
-        base_name, _ = os.path.splitext(filename)
-        # Ensure target_format starts with dot if not provided (though it should be)
-        if not target_format.startswith("."):
-            target_format = f".{target_format}"
-            
-        output_filename = f"{base_name}{target_format}"
-        output_path = os.path.join(output_dir, output_filename)
-
-        logger.info(f"Starting conversion: {input_path} -> {output_path} using {converter.meta.name}")
-        
-        # Execute conversion
-        result_path = await converter.convert(input_path, output_path, target_format=target_format)
-        
-        return result_path
+    async def _run_step(
+        self, edge: Edge, input_path: str, output_path: str, options: Dict[str, Any], reject_when_busy: bool
+    ) -> str:
+        """
+        Run a single plugin conversion and fold its duration into the edge cost.
+        """
+        converter = self._registry.load(edge.source)
+        async with self._admission.admit(converter.meta.name, reject_when_busy):
+            logger.info(f"Starting conversion: {input_path} -> {output_path} using {converter.meta.name}")
+            start = time.perf_counter()
+
+            # Execute conversion
+            # Blocking plugins run in the executor pool so the event loop stays responsive
+            if converter.is_blocking():
+                result = await self._executor.run(
+                    converter.workload, converter.convert_sync, input_path, output_path, edge.target, **options
+                )
+            else:
+                result = await converter.convert(input_path, output_path, target_format=edge.target, **options)
+
+        self._graph.record(edge, time.perf_counter() - start)
+        return result
+
+    @staticmethod
+    def _share_result(source_path: str, target_path: str):
+        """
+        Give a waiter its own copy of a shared result (hard link when possible).
+        """
+        if os.path.exists(target_path):
+            os.remove(target_path)
+        try:
+            os.link(source_path, target_path)
+        except OSError:
+            shutil.copyfile(source_path, target_path)
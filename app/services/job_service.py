@@ -0,0 +1,245 @@
+import asyncio
+import os
+import time
+import uuid
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+from loguru import logger
+from pydantic import BaseModel
+
+from app.core.progress import ProgressTracker, current_progress
+from app.core.report import collect_details
+from app.services.converter_service import ConverterService
+from app.services.workspace_service import Workspace, WorkspaceManager
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """
+    State of an asynchronous conversion job.
+
+    Attributes:
+        id (str): Unique job identifier returned to the client.
+        status (JobStatus): Current lifecycle state.
+        filename (str): Original name of the uploaded file.
+        target_format (str): Requested target format extension.
+        options (dict): Plugin-specific conversion options.
+        created_at (float): Submission timestamp (epoch seconds).
+        started_at (float, optional): When a worker picked the job up.
+        finished_at (float, optional): When the conversion succeeded or failed.
+        error (str, optional): Failure reason for failed jobs.
+        details (dict): How the conversion was performed, e.g. {"strategy": "remux"}.
+    """
+    id: str
+    status: JobStatus = JobStatus.QUEUED
+    filename: str
+    target_format: str
+    options: Dict[str, Any] = {}
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    details: Dict[str, str] = {}
+
+    # Server-side paths, never exposed through the API
+    input_path: str
+    work_dir: str
+    output_path: Optional[str] = None
+    content_hash: Optional[str] = None
+
+    def public_dict(self) -> dict:
+        return self.model_dump(exclude={"input_path", "work_dir", "output_path", "content_hash"})
+
+
+class JobManager:
+    """
+    In-process scheduler for asynchronous conversions.
+
+    Jobs are queued in a bounded queue and executed by a fixed number of worker
+    tasks through `ConverterService.execute_conversion`, so request latency is
+    independent of conversion time.
+    """
+
+    def __init__(
+        self,
+        converter_service: ConverterService,
+        workspaces: WorkspaceManager,
+        max_workers: int = 2,
+        max_queue: int = 100,
+        result_ttl: float = 3600,
+    ):
+        self._service = converter_service
+        self._workspaces = workspaces
+        self._max_workers = max_workers
+        self._max_queue = max_queue
+        self._result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        self._job_workspaces: Dict[str, Workspace] = {}
+        self._progress: Dict[str, ProgressTracker] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_workers(self):
+        """
+        Start the worker tasks on the running event loop if they are not running yet.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._workers:
+            return
+        # Fresh loop (first use or application restart): drop stale state
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"job-worker-{i}")
+            for i in range(self._max_workers)
+        ]
+        logger.info(f"Started {self._max_workers} job workers")
+
+    def create_job(self, filename: str, target_format: str = "") -> Job:
+        """
+        Allocate a job and its private working directory.
+        The caller saves the upload to `job.input_path`, sets the target format
+        if it was not known yet and then calls `enqueue`.
+        """
+        self._prune_expired()
+        workspace = self._workspaces.create()
+        job = Job(
+            id=uuid.uuid4().hex,
+            filename=filename,
+            target_format=target_format,
+            created_at=time.time(),
+            input_path=workspace.input_path(filename),
+            work_dir=workspace.root,
+        )
+        self._jobs[job.id] = job
+        self._job_workspaces[job.id] = workspace
+        self._progress[job.id] = ProgressTracker()
+        return job
+
+    async def enqueue(self, job: Job):
+        """
+        Put a created job on the queue.
+
+        Raises:
+            HTTPException: 503 if the queue is full.
+        """
+        self._ensure_workers()
+        try:
+            self._queue.put_nowait(job.id)
+        except asyncio.QueueFull:
+            self.discard(job.id)
+            raise HTTPException(status_code=503, detail="Job queue is full, try again later")
+        logger.info(f"Queued job {job.id}: {job.filename} -> {job.target_format}")
+
+    def get(self, job_id: str) -> Job:
+        """
+        Look up a job by id.
+
+        Raises:
+            HTTPException: 404 if the job is unknown or expired.
+        """
+        job = self._jobs.get(job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+        return job
+
+    def get_progress(self, job_id: str) -> ProgressTracker:
+        """
+        Look up the progress tracker of a job.
+
+        Raises:
+            HTTPException: 404 if the job is unknown or expired.
+        """
+        self.get(job_id)
+        return self._progress[job_id]
+
+    def discard(self, job_id: str):
+        """
+        Forget a job and remove its files.
+        """
+        self._jobs.pop(job_id, None)
+        self._progress.pop(job_id, None)
+        workspace = self._job_workspaces.pop(job_id, None)
+        if workspace:
+            self._workspaces.remove(workspace)
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    def _prune_expired(self):
+        """
+        Drop finished jobs whose results outlived the retention period.
+        """
+        now = time.time()
+        expired = [
+            job.id for job in self._jobs.values()
+            if job.finished_at and now - job.finished_at > self._result_ttl
+        ]
+        for job_id in expired:
+            logger.debug(f"Expiring job {job_id}")
+            self.discard(job_id)
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job):
+        workspace = self._job_workspaces[job.id]
+        tracker = self._progress[job.id]
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        tracker.update(status="running")
+        # Plugins publish progress to the tracker of the job they are running for
+        token = current_progress.set(tracker)
+        try:
+            with collect_details() as job.details:
+                job.output_path = await self._service.execute_conversion(
+                    job.input_path, workspace.output_dir, target_format=job.target_format,
+                    options=job.options, content_hash=job.content_hash,
+                    # The job queue is already bounded; wait for a plugin slot instead of failing
+                    reject_when_busy=False,
+                )
+            job.status = JobStatus.SUCCEEDED
+            logger.info(f"Job {job.id} succeeded")
+        except Exception as e:
+            job.status = JobStatus.FAILED
+            job.error = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"Job {job.id} failed: {job.error}")
+        finally:
+            current_progress.reset(token)
+            job.finished_at = time.time()
+            if job.status == JobStatus.SUCCEEDED:
+                tracker.update(status="done", percent=100.0, eta=0.0)
+            else:
+                tracker.update(status="done")
+            # The upload is no longer needed once the job has run
+            if os.path.exists(job.input_path):
+                os.remove(job.input_path)
+            # Keep the result for download, but let the sweeper reclaim it if needed
+            self._workspaces.release(workspace)
+
+    async def shutdown(self):
+        """
+        Cancel the worker tasks. Queued jobs are left in their current state.
+        """
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._loop = None
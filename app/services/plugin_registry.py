@@ -0,0 +1,232 @@
+import ast
+import importlib
+import inspect
+import os
+import pkgutil
+import threading
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+from loguru import logger
+from pydantic import BaseModel
+
+import app.plugins
+from app.core.executor import Workload
+from app.plugins.base import BaseConverter, ConverterMeta
+
+
+class PluginSpec(BaseModel):
+    """
+    What is known about a plugin before its module is imported.
+
+    Attributes:
+        module (str): Full module name, e.g. "app.plugins.pdf_plugin".
+        class_name (str): Name of the BaseConverter subclass.
+        source_format (str): Source extension the instance is registered for.
+        meta (ConverterMeta): The plugin's metadata for this source format.
+        workload (Workload): The plugin's declared workload.
+        takes_source_format (bool): Whether `__init__` accepts `source_format`.
+    """
+    module: str
+    class_name: str
+    source_format: str
+    meta: ConverterMeta
+    workload: Workload = Workload.IO
+    takes_source_format: bool = False
+
+
+def _evaluate(node: ast.expr, source_format: str):
+    """
+    Evaluate a metadata expression from a plugin's source. Only literals and
+    `self._source_format` (set by the registration convention) are available.
+    """
+    expression = ast.Expression(body=node)
+    ast.fix_missing_locations(expression)
+    code = compile(expression, "<plugin metadata>", "eval")
+    return eval(code, {"__builtins__": {}}, {"self": SimpleNamespace(_source_format=source_format)})
+
+
+def _returned_call(function: ast.FunctionDef, name: str) -> Optional[ast.Call]:
+    for node in ast.walk(function):
+        if (isinstance(node, ast.Return) and isinstance(node.value, ast.Call)
+                and isinstance(node.value.func, ast.Name) and node.value.func.id == name):
+            return node.value
+    return None
+
+
+def scan_plugin_source(source: str, module: str) -> Optional[List[PluginSpec]]:
+    """
+    Read plugin specs from a module's source code without importing it.
+
+    Returns:
+        List[PluginSpec], optional: One spec per (plugin, source format), or None
+            if the module's metadata cannot be read statically.
+    """
+    try:
+        tree = ast.parse(source)
+        specs = []
+        for cls in tree.body:
+            if not isinstance(cls, ast.ClassDef):
+                continue
+            if not any(isinstance(base, ast.Name) and base.id == "BaseConverter" for base in cls.bases):
+                continue
+
+            methods = {node.name: node for node in cls.body if isinstance(node, ast.FunctionDef)}
+            workload = Workload.IO
+            for node in cls.body:
+                if (isinstance(node, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "workload" for t in node.targets)
+                        and isinstance(node.value, ast.Attribute)):
+                    workload = Workload[node.value.attr]
+
+            formats_return = next(n for n in ast.walk(methods["supported_source_formats"]) if isinstance(n, ast.Return))
+            meta_call = _returned_call(methods["meta"], "ConverterMeta")
+            init = methods.get("__init__")
+            takes_source_format = init is not None and any(arg.arg == "source_format" for arg in init.args.args)
+
+            for fmt in ast.literal_eval(formats_return.value):
+                meta = ConverterMeta(**{kw.arg: _evaluate(kw.value, fmt) for kw in meta_call.keywords})
+                specs.append(PluginSpec(
+                    module=module,
+                    class_name=cls.name,
+                    source_format=fmt,
+                    meta=meta,
+                    workload=workload,
+                    takes_source_format=takes_source_format,
+                ))
+        return specs or None
+    except Exception as e:
+        logger.debug(f"Cannot read plugin metadata of {module} statically: {e}")
+        return None
+
+
+class PluginRegistry:
+    """
+    Registry of converter plugins that imports a plugin module only on first use.
+
+    Plugin metadata is read from the module source, so heavy dependencies
+    (PyMuPDF, pdf2docx, Pillow) are not imported at startup. Modules whose
+    metadata cannot be read that way are imported right away.
+    """
+
+    def __init__(self, package=app.plugins):
+        self._package = package
+        self._specs: Dict[str, PluginSpec] = {}
+        self._instances: Dict[str, BaseConverter] = {}
+        self._lock = threading.Lock()
+
+    def discover(self):
+        """
+        Find every plugin in the package.
+        """
+        package_path = os.path.dirname(self._package.__file__)
+        package_name = self._package.__name__
+
+        # Iterate over all modules in the plugins package
+        for _, name, _ in pkgutil.iter_modules([package_path]):
+            # Skip base module
+            if name == "base":
+                continue
+
+            module_name = f"{package_name}.{name}"
+            try:
+                with open(os.path.join(package_path, f"{name}.py"), "r", encoding="utf-8") as f:
+                    specs = scan_plugin_source(f.read(), module_name)
+            except OSError:
+                specs = None
+
+            if specs is None:
+                self._register_module(module_name)
+                continue
+            for spec in specs:
+                self._specs[spec.source_format] = spec
+                logger.info(f"Registered plugin: {spec.meta.name} for {spec.source_format}")
+
+    def _register_module(self, module_name: str):
+        """
+        Import a module and register its plugins from the live classes.
+        """
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            logger.error(f"Error loading plugin module {module_name}: {e}")
+            return
+
+        # Inspect module for BaseConverter subclasses
+        for _, obj in inspect.getmembers(module):
+            if not (inspect.isclass(obj) and issubclass(obj, BaseConverter) and obj is not BaseConverter):
+                continue
+            takes_source_format = "source_format" in inspect.signature(obj.__init__).parameters
+            for fmt in obj.supported_source_formats():
+                try:
+                    instance = obj(source_format=fmt) if takes_source_format else obj()
+                except Exception as e:
+                    logger.error(f"Failed to instantiate plugin {obj.__name__} for {fmt}: {e}")
+                    continue
+                self._specs[fmt] = PluginSpec(
+                    module=module_name,
+                    class_name=obj.__name__,
+                    source_format=fmt,
+                    meta=instance.meta,
+                    workload=obj.workload,
+                    takes_source_format=takes_source_format,
+                )
+                self._instances[fmt] = instance
+                logger.info(f"Registered plugin: {instance.meta.name} for {fmt}")
+
+    def specs(self) -> Dict[str, PluginSpec]:
+        """
+        Get the spec of every registered source format.
+        """
+        return self._specs
+
+    def get_spec(self, source_format: str) -> Optional[PluginSpec]:
+        return self._specs.get(source_format)
+
+    def load(self, source_format: str) -> BaseConverter:
+        """
+        Get the plugin instance for a source format, importing its module on first use.
+
+        Raises:
+            KeyError: If no plugin is registered for the source format.
+            HTTPException: 500 if the plugin module fails to import.
+        """
+        instance = self._instances.get(source_format)
+        if instance is not None:
+            return instance
+
+        spec = self._specs[source_format]
+        # Executor threads may load the same plugin at once
+        with self._lock:
+            instance = self._instances.get(source_format)
+            if instance is None:
+                try:
+                    cls = getattr(importlib.import_module(spec.module), spec.class_name)
+                    # Multi-format plugins take the source format, single-format ones hardcode it in meta
+                    instance = cls(source_format=source_format) if spec.takes_source_format else cls()
+                except Exception as e:
+                    logger.error(f"Failed to load plugin {spec.meta.name} from {spec.module}: {e}")
+                    raise HTTPException(status_code=500, detail=f"Plugin {spec.meta.name} is unavailable")
+                self._instances[source_format] = instance
+                logger.info(f"Loaded plugin: {spec.meta.name} for {source_format}")
+        return instance
+
+    def loaded(self) -> List[str]:
+        """
+        Source formats whose plugin has been imported.
+        """
+        return list(self._instances)
+
+    def prewarm(self, names: List[str]):
+        """
+        Import plugins ahead of their first use.
+
+        Args:
+            names (List[str]): Plugin names or source extensions; "*" loads every plugin.
+        """
+        for source_format, spec in self._specs.items():
+            if "*" in names or source_format in names or spec.meta.name in names:
+                try:
+                    self.load(source_format)
+                except HTTPException:
+                    pass
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from loguru import logger
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls sharing a key into a single execution.
+
+    The first caller for a key starts the work; callers arriving while it is still
+    running wait for the same result (or exception) instead of starting their own.
+    The shared task is shielded, so a cancelled caller does not abort the work for
+    the remaining waiters.
+    """
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run `func` once per key among concurrent callers.
+
+        Args:
+            key (str): Identity of the work.
+            func (Callable): Coroutine factory performing the work.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it was shared from another caller's execution.
+        """
+        future = self._calls.get(key)
+        shared = future is not None
+        if not shared:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        else:
+            logger.info(f"Joining in-flight conversion {key[:12]}")
+
+        return await asyncio.shield(future), shared
+
+    def _forget(self, key: str, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not future.cancelled():
+            future.exception()
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import shutil
+import time
+import uuid
+from typing import List, Optional, Set, Tuple
+
+from loguru import logger
+
+
+class Workspace:
+    """
+    Isolated working directory of a single conversion request.
+
+    Layout:
+        <root>/input/   the uploaded file
+        <root>/output/  conversion results
+    """
+
+    def __init__(self, root: str):
+        self.id = os.path.basename(root)
+        self.root = root
+        self.input_dir = os.path.join(root, "input")
+        self.output_dir = os.path.join(root, "output")
+
+    def input_path(self, filename: str) -> str:
+        """
+        Path for an uploaded file, stripped of any client-supplied directories.
+        """
+        return os.path.join(self.input_dir, os.path.basename(filename))
+
+
+class WorkspaceManager:
+    """
+    Allocates per-request working directories and sweeps abandoned ones.
+
+    Every request gets its own directory, so concurrent uploads with the same file
+    name never collide. Directories are removed by their owner when the request
+    completes; the sweeper catches whatever is left behind by crashes, removing
+    unused directories older than the TTL and the oldest ones when the total size
+    exceeds the disk budget.
+    """
+
+    def __init__(self, root: str, ttl: float = 7200, max_bytes: Optional[int] = None):
+        self._root = os.path.abspath(root)
+        self._ttl = ttl
+        self._max_bytes = max_bytes
+        # Workspaces of requests still in progress, never swept
+        self._active: Set[str] = set()
+        self._sweeper: Optional[asyncio.Task] = None
+        os.makedirs(self._root, exist_ok=True)
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def create(self) -> Workspace:
+        """
+        Create a new workspace, protected from the sweeper until `release` or `remove`.
+        """
+        workspace = Workspace(os.path.join(self._root, uuid.uuid4().hex))
+        os.makedirs(workspace.input_dir)
+        os.makedirs(workspace.output_dir)
+        self._active.add(workspace.id)
+        return workspace
+
+    def release(self, workspace: Workspace):
+        """
+        Mark a workspace as no longer in use. It stays on disk (e.g. a job result
+        waiting for download) but becomes eligible for sweeping.
+        """
+        self._active.discard(workspace.id)
+        if os.path.exists(workspace.root):
+            # Start the TTL from now, not from creation
+            os.utime(workspace.root)
+
+    def remove(self, workspace: Workspace):
+        self._active.discard(workspace.id)
+        shutil.rmtree(workspace.root, ignore_errors=True)
+
+    def sweep(self) -> int:
+        """
+        Remove expired workspaces, then the oldest ones while over the disk budget.
+        Blocking; run it in a thread.
+
+        Returns:
+            int: Number of directories removed.
+        """
+        now = time.time()
+        candidates: List[Tuple[float, int, str]] = []
+        total_bytes = 0
+        removed = 0
+
+        for entry in os.scandir(self._root):
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            size = _dir_size(entry.path)
+            total_bytes += size
+            if entry.name in self._active:
+                continue
+            mtime = entry.stat().st_mtime
+            if now - mtime > self._ttl:
+                shutil.rmtree(entry.path, ignore_errors=True)
+                total_bytes -= size
+                removed += 1
+            else:
+                candidates.append((mtime, size, entry.path))
+
+        if self._max_bytes is not None and total_bytes > self._max_bytes:
+            for _, size, path in sorted(candidates):
+                if total_bytes <= self._max_bytes:
+                    break
+                shutil.rmtree(path, ignore_errors=True)
+                total_bytes -= size
+                removed += 1
+            if total_bytes > self._max_bytes:
+                logger.warning(f"Workspaces use {total_bytes} bytes, over budget with only active requests left")
+
+        if removed:
+            logger.info(f"Swept {removed} workspaces, {total_bytes} bytes remaining")
+        return removed
+
+    async def _sweep_loop(self, interval: float):
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logger.error(f"Workspace sweep failed: {e}")
+            await asyncio.sleep(interval)
+
+    def start_sweeper(self, interval: float):
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_loop(interval), name="workspace-sweeper")
+
+    async def stop_sweeper(self):
+        if self._sweeper:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+            self._sweeper = None
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except FileNotFoundError:
+                pass
+    return total
@@ -0,0 +1,78 @@
+"""
+Compare single-process and segment-parallel video transcoding.
+
+Generates a test video with ffmpeg's lavfi sources, then transcodes it to the
+target format once per worker count and prints the throughput of each run.
+Requires ffmpeg and ffprobe on the PATH (or FFMPEG_BINARY / FFPROBE_BINARY).
+
+    python -m benchmarks.video_segments --duration 300 --workers 1 4 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.plugins import video_plugin  # noqa: E402
+from app.plugins.video_plugin import VideoConverter  # noqa: E402
+
+settings = video_plugin.settings
+
+
+def make_input(path: str, duration: float, size: str, gop: int):
+    subprocess.run(
+        [
+            settings.FFMPEG_BINARY, "-v", "error",
+            "-f", "lavfi", "-i", f"testsrc2=size={size}:rate=30",
+            "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000",
+            "-t", str(duration), "-c:v", "libx264", "-g", str(gop), "-c:a", "aac",
+            "-y", path,
+        ],
+        check=True,
+    )
+
+
+async def run(input_path: str, output_path: str, target_format: str, workers: int) -> float:
+    # One worker is the single-process path
+    settings.VIDEO_SEGMENT_MIN_DURATION = 0.0 if workers > 1 else None
+    settings.VIDEO_SEGMENT_WORKERS = workers
+    started = time.perf_counter()
+    await VideoConverter().convert(input_path, output_path, target_format)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=120.0, help="Test video length in seconds")
+    parser.add_argument("--size", default="1280x720", help="Test video resolution")
+    parser.add_argument("--gop", type=int, default=60, help="Frames between keyframes")
+    parser.add_argument("--target", default=".avi", help="Target format (.avi or .mkv)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="video-bench-") as work_dir:
+        input_path = os.path.join(work_dir, "input.mp4")
+        make_input(input_path, args.duration, args.size, args.gop)
+
+        results = []
+        for workers in args.workers:
+            output_path = os.path.join(work_dir, f"output-{workers}{args.target}")
+            elapsed = asyncio.run(run(input_path, output_path, args.target, workers))
+            results.append({
+                "workers": workers,
+                "seconds": round(elapsed, 3),
+                "realtime_factor": round(args.duration / elapsed, 2),
+                "output_bytes": os.path.getsize(output_path),
+            })
+            print(f"{workers:>3} worker(s): {elapsed:8.2f}s  {args.duration / elapsed:6.2f}x realtime", file=sys.stderr)
+
+    print(json.dumps({"duration": args.duration, "size": args.size, "target": args.target, "runs": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,15 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from app.api.routes import router as api_router
+from app.api.routes import converter_service, job_manager, router as api_router, workspaces
 from app.core.config import get_settings
-from app.core.logger import setup_logging
+from app.core.executor import get_executor_pool
+from app.core.logger import logger, setup_logging
+from app.core.office_pool import get_office_pool
 from app.middlewares.access_log import AccessLogMiddleware
 
 # Initialize Enterprise Logging
@@ -13,9 +17,30 @@ setup_logging()
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.PLUGIN_PREWARM:
+        converter_service.prewarm(settings.PLUGIN_PREWARM)
+    if settings.OFFICE_POOL_ENABLED and settings.OFFICE_POOL_WARM_ON_STARTUP:
+        try:
+            await get_office_pool().warm_up()
+        except Exception as e:
+            logger.error(f"Failed to warm up LibreOffice pool: {e}")
+    workspaces.start_sweeper(settings.WORK_SWEEP_INTERVAL)
+    yield
+    await workspaces.stop_sweeper()
+    await job_manager.shutdown()
+    if settings.OFFICE_POOL_ENABLED:
+        await get_office_pool().shutdown()
+    # Release executor workers (threads/processes) on shutdown
+    get_executor_pool().shutdown(wait=False)
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
+    lifespan=lifespan,
 )
 
 # Add Access Log Middleware
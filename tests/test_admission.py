@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services.admission import AdmissionController
+from app.services.converter_service import ConverterService
+
+
+@pytest.mark.asyncio
+async def test_queue_full_rejects_with_retry_after():
+    controller = AdmissionController(limits={"video-converter": 1}, queue_limits={"video-converter": 1})
+    release = asyncio.Event()
+
+    async def hold():
+        async with controller.admit("video-converter"):
+            await release.wait()
+
+    running = asyncio.create_task(hold())
+    queued = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as excinfo:
+        async with controller.admit("video-converter"):
+            pass
+
+    assert excinfo.value.status_code == 429
+    assert int(excinfo.value.headers["Retry-After"]) >= 1
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert controller.stats()["video-converter"]["active"] == 0
+
+
+@pytest.mark.asyncio
+async def test_plugins_are_limited_independently():
+    """A saturated plugin does not block admission of other plugins."""
+    controller = AdmissionController(limits={"video-converter": 1}, queue_limits={"video-converter": 0})
+
+    async with controller.admit("video-converter"):
+        async with controller.admit("json2md"):
+            pass
+        with pytest.raises(HTTPException):
+            async with controller.admit("video-converter"):
+                pass
+
+
+@pytest.mark.asyncio
+async def test_waiters_proceed_in_order_when_not_rejecting():
+    controller = AdmissionController(limits={"office-converter": 1}, queue_limits={"office-converter": 0})
+    order = []
+
+    async def work(i):
+        async with controller.admit("office-converter", reject_when_busy=False):
+            order.append(i)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[work(i) for i in range(3)])
+    assert order == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_service_rejects_when_plugin_saturated(tmp_path, mocker):
+    controller = AdmissionController(limits={"json2md": 1}, queue_limits={"json2md": 0})
+    service = ConverterService(admission=controller)
+    converter = service.get_converter("a.json")
+
+    async def slow_convert(input_path, output_path, target_format, **kwargs):
+        await asyncio.sleep(0.05)
+        return output_path
+
+    mocker.patch.object(converter, "convert", side_effect=slow_convert)
+    for name in ("a.json", "b.json"):
+        (tmp_path / name).write_text("{}")
+
+    results = await asyncio.gather(
+        service.execute_conversion(str(tmp_path / "a.json"), str(tmp_path), ".md"),
+        service.execute_conversion(str(tmp_path / "b.json"), str(tmp_path), ".md"),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 429
@@ -122,3 +122,41 @@ def test_convert_file_cleanup_on_error(client, mocker):
     assert mock_remove.call_count >= 1
     # We can inspect call args if we want to be strict, but determining the exact temp path is tricky without regex match on the uuid/filename.
 
+
+def test_convert_multi_returns_archive(client):
+    """Test converting one upload to several formats at once."""
+    import zipfile
+    import fitz
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Hello multi")
+    pdf_bytes = doc.tobytes()
+    doc.close()
+
+    files = {"file": ("sample.pdf", io.BytesIO(pdf_bytes), "application/pdf")}
+    data = {"target_formats": ".txt, .md, .docx, .txt"}
+    response = client.post("/api/v1/convert/multi", files=files, data=data)
+
+    assert response.status_code == 200
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert sorted(archive.namelist()) == ["sample.docx", "sample.md", "sample.txt"]
+        assert "Hello multi" in archive.read("sample.txt").decode("utf-8")
+        assert archive.read("sample.md").decode("utf-8").startswith("# Extracted Text")
+
+    # Unsupported targets are rejected as a whole
+    files = {"file": ("sample.pdf", io.BytesIO(pdf_bytes), "application/pdf")}
+    response = client.post("/api/v1/convert/multi", files=files, data={"target_formats": ".txt,.mp3"})
+    assert response.status_code == 400
+
+def test_capabilities_etag(client):
+    """Test that capabilities are revalidated with their ETag."""
+    response = client.get("/api/v1/capabilities")
+    etag = response.headers["etag"]
+
+    cached = client.get("/api/v1/capabilities", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    stale = client.get("/api/v1/capabilities", headers={"If-None-Match": '"other"'})
+    assert stale.status_code == 200
+    assert stale.json() == response.json()
@@ -0,0 +1,61 @@
+import io
+
+from app.services.cache_service import ResultCache
+
+
+def write(path, size):
+    path.write_bytes(b"x" * size)
+    return str(path)
+
+
+def test_cache_key_depends_on_all_inputs():
+    key = ResultCache.make_key("abc", "pdf-converter", ".txt")
+    assert key == ResultCache.make_key("abc", "pdf-converter", "txt")
+    assert key != ResultCache.make_key("abd", "pdf-converter", ".txt")
+    assert key != ResultCache.make_key("abc", "pdf-converter", ".md")
+    assert key != ResultCache.make_key("abc", "pdf-converter", ".txt", {"pages": "1-2"})
+
+
+def test_cache_hit_miss_and_lru_eviction(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=250)
+
+    assert cache.get("a") is None
+    cache.put("a", write(tmp_path / "a.txt", 100))
+    cache.put("b", write(tmp_path / "b.txt", 100))
+    assert cache.get("a") is not None  # "a" becomes most recently used
+
+    cache.put("c", write(tmp_path / "c.txt", 100))  # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] == 200
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_cache_index_survives_restart(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_bytes=1000)
+    cache.put("a", write(tmp_path / "a.md", 10))
+
+    reloaded = ResultCache(str(tmp_path / "cache"), max_bytes=1000)
+    assert reloaded.get("a").endswith("a.md")
+
+
+def test_convert_served_from_cache(client, mocker):
+    """A repeated conversion of identical bytes skips execute_conversion."""
+    import app.api.routes
+
+    files = {"file": ("cached.json", io.BytesIO(b'{"cached": true}'), "application/json")}
+    first = client.post("/api/v1/convert", files=files, data={"target_format": ".md"})
+    assert first.status_code == 200
+
+    spy = mocker.patch.object(app.api.routes.converter_service, "execute_conversion")
+    files = {"file": ("again.json", io.BytesIO(b'{"cached": true}'), "application/json")}
+    second = client.post("/api/v1/convert", files=files, data={"target_format": ".md"})
+
+    assert second.status_code == 200
+    assert second.content == first.content
+    assert 'filename="again.md"' in second.headers["content-disposition"]
+    spy.assert_not_called()
@@ -0,0 +1,55 @@
+import pytest
+from PIL import Image
+
+from app.core.executor import Workload
+from app.plugins.base import ConverterMeta
+from app.services.conversion_graph import ConversionGraph
+from app.services.converter_service import ConverterService
+
+
+def build_graph(max_hops=3):
+    graph = ConversionGraph(max_hops=max_hops)
+    for name, targets in [("a", ["b", ".c"]), ("b", [".d"]), ("c", [".d", ".e"]), ("e", [".f"])]:
+        meta = ConverterMeta(name=name, description="", source_format=f".{name}", supported_targets=targets)
+        graph.add_plugin(f".{name}", meta, Workload.IO)
+    return graph
+
+
+def test_cheapest_path_follows_measured_costs():
+    graph = build_graph()
+    [a_b] = graph.find_path(".a", ".b")
+    [b_d] = graph.find_path(".b", ".d")
+    graph.record(a_b, 10.0)
+    graph.record(b_d, 10.0)
+    assert [edge.plugin for edge in graph.find_path(".A", "d")] == ["a", "c"]
+
+    [c_d] = graph.find_path(".c", ".d")
+    graph.record(c_d, 50.0)
+    assert [edge.plugin for edge in graph.find_path(".a", ".d")] == ["a", "b"]
+
+
+def test_direct_edge_and_hop_limit():
+    graph = build_graph(max_hops=2)
+    # "b" is declared without a dot but still routes as ".b"
+    assert [edge.target for edge in graph.find_path(".a", ".b")] == [".b"]
+    assert graph.find_path(".a", ".f") is None
+    assert ".f" not in graph.routes(".a")
+    assert [edge.target for edge in build_graph().find_path(".a", ".f")] == [".c", ".e", ".f"]
+
+
+@pytest.mark.asyncio
+async def test_multi_step_conversion(tmp_path):
+    """PNG -> TXT has no direct plugin and is routed through PDF."""
+    service = ConverterService()
+    input_path = tmp_path / "in" / "image.png"
+    input_path.parent.mkdir()
+    Image.new("RGB", (20, 20), "white").save(input_path)
+
+    assert ".txt" in service.get_supported_conversions()[".png"]
+    assert service.get_conversion_costs()[".png"][".txt"]["path"] == [".png", ".pdf", ".txt"]
+
+    output_path = await service.execute_conversion(str(input_path), str(tmp_path), ".txt")
+
+    assert output_path == str(tmp_path / "image.txt")
+    # The intermediate PDF is removed
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["image.txt", "in"]
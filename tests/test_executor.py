@@ -0,0 +1,46 @@
+import threading
+
+import pytest
+from PIL import Image
+
+from app.core.executor import ExecutorPool, Workload
+from app.plugins.image_plugin import ImageConverter
+from app.plugins.json_to_md import JsonToMdConverter
+from app.plugins.pdf_plugin import PdfConverter
+from app.services.converter_service import ConverterService
+
+
+def test_plugins_declare_workload():
+    """Blocking plugins expose convert_sync and a matching workload."""
+    assert PdfConverter.is_blocking()
+    assert PdfConverter.workload == Workload.CPU
+    assert ImageConverter.is_blocking()
+    assert not JsonToMdConverter.is_blocking()
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_off_event_loop_thread():
+    """CPU work runs in a worker thread, not on the event loop thread."""
+    pool = ExecutorPool(cpu_mode="thread", cpu_workers=1)
+    try:
+        name = await pool.run(Workload.CPU, lambda: threading.current_thread().name)
+        assert name != threading.current_thread().name
+        assert name.startswith("convert-cpu")
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_service_offloads_blocking_plugin(tmp_path):
+    """execute_conversion runs convert_sync of blocking plugins in a process pool."""
+    input_path = tmp_path / "pixel.png"
+    Image.new("RGBA", (4, 4), (255, 0, 0, 128)).save(input_path)
+
+    pool = ExecutorPool(cpu_mode="process", cpu_workers=1)
+    try:
+        service = ConverterService(executor=pool)
+        output_path = await service.execute_conversion(str(input_path), str(tmp_path), ".jpg")
+        with Image.open(output_path) as img:
+            assert img.format == "JPEG"
+    finally:
+        pool.shutdown()
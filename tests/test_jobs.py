@@ -0,0 +1,74 @@
+import io
+import time
+
+
+def wait_for_job(client, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = client.get(f"/api/v1/jobs/{job_id}").json()
+        if job["status"] in ("succeeded", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"Job {job_id} did not finish in time")
+
+
+def test_job_lifecycle(client):
+    """Submit a job, poll its status and download the result."""
+    files = {"file": ("job.json", io.BytesIO(b'{"job": "ok"}'), "application/json")}
+    response = client.post("/api/v1/jobs", files=files, data={"target_format": ".md"})
+
+    assert response.status_code == 202
+    body = response.json()
+    assert body["status"] == "queued"
+    assert body["result_url"].endswith(f"/jobs/{body['job_id']}/result")
+
+    job = wait_for_job(client, body["job_id"])
+    assert job["status"] == "succeeded"
+    assert "input_path" not in job
+
+    result = client.get(body["result_url"])
+    assert result.status_code == 200
+    assert '"job": "ok"' in result.content.decode("utf-8")
+
+
+def test_job_failure_is_reported(client):
+    """Conversion errors are reported through the job status."""
+    files = {"file": ("broken.json", io.BytesIO(b'{not json'), "application/json")}
+    response = client.post("/api/v1/jobs", files=files, data={"target_format": ".md"})
+    job = wait_for_job(client, response.json()["job_id"])
+
+    assert job["status"] == "failed"
+    assert "Failed to parse JSON" in job["error"]
+
+    result = client.get(f"/api/v1/jobs/{job['id']}/result")
+    assert result.status_code == 409
+
+
+def test_job_unsupported_format(client):
+    """Unknown source formats are rejected at submission time."""
+    files = {"file": ("test.xyz", io.BytesIO(b"data"), "text/plain")}
+    response = client.post("/api/v1/jobs", files=files, data={"target_format": ".md"})
+    assert response.status_code == 400
+
+
+def test_job_not_found(client):
+    response = client.get("/api/v1/jobs/does-not-exist")
+    assert response.status_code == 404
+
+
+def test_job_progress_and_events(client):
+    """Finished jobs report completion through the progress endpoint and the event stream."""
+    files = {"file": ("progress.json", io.BytesIO(b'{"a": 1}'), "application/json")}
+    job_id = client.post("/api/v1/jobs", files=files, data={"target_format": ".md"}).json()["job_id"]
+    wait_for_job(client, job_id)
+
+    progress = client.get(f"/api/v1/jobs/{job_id}/progress").json()
+    assert progress["job_status"] == "succeeded"
+    assert progress["status"] == "done"
+    assert progress["percent"] == 100.0
+
+    response = client.get(f"/api/v1/jobs/{job_id}/events")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [block for block in response.text.split("\n\n") if block]
+    assert events[0].startswith("event: progress")
+    assert events[-1].startswith("event: end")
@@ -0,0 +1,108 @@
+import fitz
+import pytest
+
+from app.plugins import pdf_plugin
+from app.plugins.pdf_plugin import PdfConverter, page_shards
+
+
+@pytest.fixture
+def sample_pdf(tmp_path):
+    path = tmp_path / "sample.pdf"
+    doc = fitz.open()
+    for i in range(12):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Page number {i}")
+    doc.save(path)
+    doc.close()
+    return str(path)
+
+
+def test_page_shards():
+    assert page_shards(10, 4) == [(0, 4), (4, 8), (8, 10)]
+    assert page_shards(3, 4) == [(0, 3)]
+
+
+@pytest.mark.parametrize("stream_pages", [True, False])
+def test_parallel_text_matches_sequential(sample_pdf, tmp_path, stream_pages):
+    converter = PdfConverter()
+    sequential = converter.convert_sync(sample_pdf, str(tmp_path / "seq.txt"), ".txt", parallel_min_pages=1000)
+    parallel = converter.convert_sync(
+        sample_pdf, str(tmp_path / "par.txt"), ".txt",
+        parallel_min_pages=2, shard_pages=5, stream_pages=stream_pages,
+    )
+
+    with open(sequential, encoding="utf-8") as f:
+        expected = f.read()
+    with open(parallel, encoding="utf-8") as f:
+        actual = f.read()
+
+    assert actual == expected
+    assert actual.index("Page number 0") < actual.index("Page number 11")
+    # Part files are cleaned up
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["par.txt", "sample.pdf", "seq.txt"]
+
+
+def test_markdown_wraps_text(sample_pdf, tmp_path):
+    output = PdfConverter().convert_sync(sample_pdf, str(tmp_path / "out.md"), ".md")
+    with open(output, encoding="utf-8") as f:
+        content = f.read()
+    assert content.startswith("# Extracted Text\n\n```text\n")
+    assert content.endswith("\n```")
+
+
+def test_parse_page_range():
+    from app.plugins.pdf_plugin import parse_page_range
+
+    assert parse_page_range("1-3,7", 10) == [0, 1, 2, 6]
+    assert parse_page_range("9-", 10) == [8, 9]
+    assert parse_page_range("all", 3) == [0, 1, 2]
+    with pytest.raises(ValueError):
+        parse_page_range("5-20", 10)
+    with pytest.raises(ValueError):
+        parse_page_range("a-b", 10)
+
+
+def test_png_defaults_to_first_page(sample_pdf, tmp_path):
+    output = PdfConverter().convert_sync(sample_pdf, str(tmp_path / "out.png"), ".png")
+    pix = fitz.Pixmap(output)
+    assert output.endswith("out.png")
+    assert (pix.width, pix.height) == (595, 842)
+
+
+def test_png_page_range_is_zipped_in_page_order(sample_pdf, tmp_path):
+    import zipfile
+
+    output = PdfConverter().convert_sync(
+        sample_pdf, str(tmp_path / "out.png"), ".png", pages="2-11", dpi=36
+    )
+
+    assert output.endswith("out.zip")
+    with zipfile.ZipFile(output) as archive:
+        names = archive.namelist()
+        first = fitz.Pixmap(archive.read(names[0]))
+    assert names == [f"page-{i:04d}.png" for i in range(2, 12)]
+    # Half the default resolution
+    assert abs(first.width - 595 / 2) <= 1 and abs(first.height - 842 / 2) <= 1
+    assert not (tmp_path / "out.png.pages").exists()
+
+
+@pytest.mark.parametrize("min_pages", [1000, 2])
+def test_docx_keeps_page_order(sample_pdf, tmp_path, monkeypatch, min_pages):
+    from docx import Document
+
+    monkeypatch.setattr(pdf_plugin.settings, "PDF_DOCX_PARALLEL_MIN_PAGES", min_pages)
+    monkeypatch.setattr(pdf_plugin.settings, "PDF_DOCX_WORKERS", 3)
+    result = PdfConverter().convert_sync(sample_pdf, str(tmp_path / "out.docx"), ".docx", pages="2-7")
+
+    text = "\n".join(p.text for p in Document(result).paragraphs)
+    positions = [text.index(f"Page number {i}") for i in range(1, 7)]
+    assert positions == sorted(positions)
+    assert "Page number 0" not in text
+    # Segment files are cleaned up
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.docx", "sample.pdf"]
+
+
+def test_docx_layout_timeout(sample_pdf, tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_plugin.settings, "PDF_DOCX_TIMEOUT", 0)
+    with pytest.raises(TimeoutError):
+        PdfConverter().convert_sync(sample_pdf, str(tmp_path / "out.docx"), ".docx")
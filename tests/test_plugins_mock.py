@@ -1,8 +1,31 @@
+import asyncio
+import os
+
 import pytest
 from unittest.mock import AsyncMock, patch
-from app.plugins.video_plugin import VideoConverter
+from app.core.ffmpeg import StreamInfo
+from app.plugins.video_plugin import VideoConverter, plan_stream_copy, segment_bounds
 from app.plugins.office_plugin import OfficeConverter
 
+def fake_ffmpeg_process(stdout=b"", stderr=b"", returncode=0):
+    """A process whose output streams replay the given bytes."""
+    process = AsyncMock()
+    process.communicate.return_value = (b"", b"")
+    for name, data in (("stdout", stdout), ("stderr", stderr)):
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        stream.feed_eof()
+        setattr(process, name, stream)
+
+    async def wait():
+        process.returncode = returncode
+        return returncode
+
+    process.returncode = None
+    process.wait.side_effect = wait
+    return process
+
+
 @pytest.mark.asyncio
 async def test_video_converter_ffmpeg_call():
     """Verify VideoConverter calls ffmpeg with correct arguments."""
@@ -12,11 +35,8 @@ async def test_video_converter_ffmpeg_call():
     
     # Mock subprocess
     with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_exec:
-        # Configure mock process
-        mock_process = AsyncMock()
-        mock_process.communicate.return_value = (b"", b"")
-        mock_process.returncode = 0
-        mock_exec.return_value = mock_process
+        # Configure mock process (ffmpeg streams its progress on stdout)
+        mock_exec.side_effect = lambda *args, **kwargs: fake_ffmpeg_process()
 
         await converter.convert(input_path, output_path, ".mp3")
         
@@ -32,24 +52,27 @@ async def test_video_converter_ffmpeg_call():
         assert output_path in args
 
 @pytest.mark.asyncio
-async def test_office_converter_soffice_call():
+async def test_office_converter_soffice_call(tmp_path):
     """Verify OfficeConverter calls soffice with correct arguments."""
     converter = OfficeConverter()
     input_path = "/tmp/doc.docx"
-    output_path = "/tmp/output/doc.pdf" # This logic depends on outdir
+    output_path = str(tmp_path / "doc.pdf") # This logic depends on outdir
     
     # Mock subprocess
     with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_exec:
         # Configure mock process
+        # soffice writes <stem>.pdf into --outdir
+        def fake_exec(*args, **kwargs):
+            outdir = args[args.index("--outdir") + 1]
+            open(os.path.join(outdir, "doc.pdf"), "wb").close()
+            return mock_process
+
         mock_process = AsyncMock()
         mock_process.communicate.return_value = (b"", b"")
         mock_process.returncode = 0
-        mock_exec.return_value = mock_process
+        mock_exec.side_effect = fake_exec
 
-        # We need to make sure shutil.move isn't actually called or we mock it too,
-        # because the plugin tries to move the file if paths differ.
-        with patch("shutil.move") as mock_move:
-            await converter.convert(input_path, output_path, ".pdf")
+        result = await converter.convert(input_path, output_path, ".pdf")
         
         # Verify call
         # Expected: soffice --headless --convert-to pdf --outdir /tmp/output /tmp/doc.docx
@@ -61,3 +84,256 @@ async def test_office_converter_soffice_call():
         assert "pdf" in args
         assert "--outdir" in args
         assert input_path in args
+        assert result == output_path
+        assert os.path.exists(output_path)
+
+
+@pytest.mark.asyncio
+async def test_office_batcher_groups_documents(tmp_path):
+    """Documents arriving within the batch window share one soffice run."""
+    import asyncio
+    from app.core.office_batch import OfficeBatcher
+
+    calls = []
+
+    async def runner(input_paths, output_dir):
+        calls.append(list(input_paths))
+        for path in input_paths:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            open(os.path.join(output_dir, f"{stem}.pdf"), "wb").close()
+
+    batcher = OfficeBatcher(runner, window=0.05, max_size=10)
+    outputs = await asyncio.gather(
+        batcher.convert("/in/a/report.docx", str(tmp_path / "r1.pdf")),
+        batcher.convert("/in/b/report.docx", str(tmp_path / "r2.pdf")),
+        batcher.convert("/in/c/slides.pptx", str(tmp_path / "s.pdf")),
+    )
+
+    # Equal stems cannot share an output directory, so two runs are needed
+    assert sorted(len(c) for c in calls) == [1, 2]
+    assert all(os.path.exists(p) for p in outputs)
+
+
+@pytest.mark.asyncio
+async def test_office_batcher_isolates_bad_document(tmp_path):
+    """A failing batch is retried per document so good documents still convert."""
+    import asyncio
+    from app.core.office_batch import OfficeBatcher
+
+    async def runner(input_paths, output_dir):
+        if any("corrupt" in p for p in input_paths):
+            raise RuntimeError("Office conversion failed")
+        for path in input_paths:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            open(os.path.join(output_dir, f"{stem}.pdf"), "wb").close()
+
+    batcher = OfficeBatcher(runner, window=0.01, max_size=2)
+    good, bad = await asyncio.gather(
+        batcher.convert("/in/good.docx", str(tmp_path / "good.pdf")),
+        batcher.convert("/in/corrupt.docx", str(tmp_path / "corrupt.pdf")),
+        return_exceptions=True,
+    )
+
+    assert good == str(tmp_path / "good.pdf")
+    assert isinstance(bad, RuntimeError)
+
+
+@pytest.mark.asyncio
+async def test_office_pool_isolates_profiles(tmp_path):
+    """Parallel pooled conversions run against distinct user profiles."""
+    import asyncio
+    from app.core.office_pool import OfficePool
+
+    pool = OfficePool(size=2, profile_root=str(tmp_path), health_interval=0)
+    gate = asyncio.Event()
+
+    async def communicate():
+        await gate.wait()
+        return (b"", b"")
+
+    with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_exec:
+        mock_process = AsyncMock()
+        mock_process.communicate.side_effect = communicate
+        mock_process.returncode = 0
+        mock_exec.return_value = mock_process
+
+        tasks = [
+            asyncio.create_task(pool.convert(f"/tmp/doc{i}.docx", f"/tmp/out/doc{i}.pdf"))
+            for i in range(2)
+        ]
+        await asyncio.sleep(0.01)
+        gate.set()
+        with patch("shutil.move"):
+            await asyncio.gather(*tasks)
+
+    profiles = {
+        arg for call in mock_exec.call_args_list for arg in call[0]
+        if arg.startswith("-env:UserInstallation=")
+    }
+    assert len(profiles) == 2
+    assert pool.stats()["jobs_done"] == 2
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_office_pool_recycles_after_max_jobs(tmp_path):
+    """Instances are restarted once they reach their job budget."""
+    from app.core.office_pool import OfficePool
+
+    pool = OfficePool(size=1, profile_root=str(tmp_path), max_jobs=2, health_interval=0)
+
+    with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_exec:
+        mock_process = AsyncMock()
+        mock_process.communicate.return_value = (b"", b"")
+        mock_process.returncode = 0
+        mock_exec.return_value = mock_process
+
+        with patch("shutil.move"):
+            for i in range(3):
+                await pool.convert(f"/tmp/doc{i}.docx", f"/tmp/out/doc{i}.pdf")
+
+    assert pool.stats()["restarts"] == 1
+    await pool.shutdown()
+
+@pytest.mark.asyncio
+async def test_video_converter_reports_progress():
+    """ffmpeg -progress blocks are turned into percent/ETA; stderr is kept bounded."""
+    from app.core.progress import ProgressTracker, current_progress
+
+    progress = (
+        b"fps=25.0\nout_time_us=5000000\nspeed=2.0x\nprogress=continue\n"
+        b"fps=25.0\nout_time_us=10000000\nspeed=2.5x\nprogress=end\n"
+    )
+    stderr = b"".join(f"line {i}\n".encode() for i in range(1000)) + b"Invalid data\n"
+    updates = []
+
+    def fake_exec(*args, **kwargs):
+        if args[0] == "ffprobe":
+            probe = AsyncMock()
+            probe.communicate.return_value = (b'{"format": {"duration": "20.0"}, "streams": []}', b"")
+            probe.returncode = 0
+            return probe
+        return fake_ffmpeg_process(progress, stderr, returncode=1)
+
+    tracker = ProgressTracker()
+    original_update = tracker.update
+    tracker.update = lambda **fields: (updates.append(fields), original_update(**fields))
+    token = current_progress.set(tracker)
+    try:
+        with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_exec:
+            mock_exec.side_effect = fake_exec
+            with pytest.raises(RuntimeError) as excinfo:
+                await VideoConverter().convert("/tmp/in.mp4", "/tmp/out.mkv", ".mkv")
+    finally:
+        current_progress.reset(token)
+
+    assert updates[0]["duration"] == 20.0
+    assert updates[1]["percent"] == 25.0 and updates[1]["eta"] == 7.5 and updates[1]["speed"] == 2.0
+    assert updates[2]["percent"] == 100.0
+    message = str(excinfo.value)
+    assert message.endswith("Invalid data")
+    assert "line 0\n" not in message and len(message.splitlines()) == 100
+
+
+def test_plan_stream_copy():
+    streams = [
+        StreamInfo(index=0, codec_type="video", codec_name="h264"),
+        StreamInfo(index=1, codec_type="audio", codec_name="aac"),
+        StreamInfo(index=2, codec_type="subtitle", codec_name="mov_text"),
+        StreamInfo(index=3, codec_type="data", codec_name="bin_data"),
+    ]
+    assert plan_stream_copy(streams[:2], "mkv") == ("remux", ["-map", "0:0", "-c:0", "copy", "-map", "0:1", "-c:1", "copy"])
+    # MKV cannot hold mov_text subtitles; they are converted while the rest is copied
+    strategy, args = plan_stream_copy(streams, "mkv")
+    assert strategy == "partial"
+    assert args[-4:] == ["-map", "0:2", "-c:2", "srt"]
+    assert "0:3" not in args
+    # Nothing in an H.264/AAC file fits AVI as is
+    assert plan_stream_copy(streams, "avi") is None
+    assert plan_stream_copy(streams, "gif") is None
+
+
+@pytest.mark.asyncio
+async def test_video_converter_remuxes():
+    """Container changes copy the streams and report the strategy."""
+    from app.core.report import collect_details
+
+    probe_output = (
+        b'{"format": {"duration": "4.0"}, "streams": ['
+        b'{"index": 0, "codec_type": "video", "codec_name": "h264"},'
+        b'{"index": 1, "codec_type": "audio", "codec_name": "aac"}]}'
+    )
+
+    def fake_exec(*args, **kwargs):
+        process = fake_ffmpeg_process()
+        if args[0] == "ffprobe":
+            process.communicate.return_value = (probe_output, b"")
+            process.returncode = 0
+        return process
+
+    with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_exec:
+        mock_exec.side_effect = fake_exec
+        with collect_details() as details:
+            await VideoConverter().convert("/tmp/in.mp4", "/tmp/out.mkv", ".mkv")
+        args = mock_exec.call_args[0]
+        assert args[1:3] == ("-i", "/tmp/in.mp4")
+        assert args.count("copy") == 2
+        assert details == {"strategy": "remux"}
+
+        with collect_details() as details:
+            await VideoConverter().convert("/tmp/in.mp4", "/tmp/out.mkv", ".mkv", remux=False)
+        assert "copy" not in mock_exec.call_args[0]
+        assert details == {"strategy": "transcode"}
+
+
+def test_segment_bounds():
+    keyframes = [1.0 + 2 * i for i in range(30)]  # every 2s from 1s, 60s long
+    assert segment_bounds(keyframes, 60.0, 3) == [(0.0, 20.0), (20.0, 40.0), (40.0, None)]
+    # Cuts move to the next keyframe; segments that would be empty are dropped
+    assert segment_bounds([0.0, 50.0], 60.0, 4) == [(0.0, 50.0), (50.0, None)]
+    assert segment_bounds([0.0], 60.0, 4) == [(0.0, None)]
+    assert segment_bounds([], 60.0, 4) == [(0.0, None)]
+
+
+@pytest.mark.asyncio
+async def test_video_converter_transcodes_segments(tmp_path, monkeypatch):
+    """Long transcodes run one ffmpeg per segment and concatenate them with stream copy."""
+    from app.core.report import collect_details
+    from app.plugins import video_plugin
+
+    monkeypatch.setattr(video_plugin.settings, "VIDEO_SEGMENT_MIN_DURATION", 30.0)
+    monkeypatch.setattr(video_plugin.settings, "VIDEO_SEGMENT_WORKERS", 3)
+    probe_output = (
+        b'{"format": {"duration": "60.0"}, "streams": ['
+        b'{"index": 0, "codec_type": "video", "codec_name": "h264"},'
+        b'{"index": 1, "codec_type": "audio", "codec_name": "aac"}]}'
+    )
+    keyframes = b"".join(f"{2.0 * i:.6f},K__\n{2.0 * i + 1:.6f},___\n".encode() for i in range(30))
+    concat_lists = []
+
+    def fake_exec(*args, **kwargs):
+        process = fake_ffmpeg_process()
+        if args[0] == "ffprobe":
+            process.communicate.return_value = (probe_output if "json" in args else keyframes, b"")
+            process.returncode = 0
+        elif "concat" in args:
+            with open(args[args.index("-i") + 1]) as f:
+                concat_lists.append(f.read())
+        return process
+
+    output_path = str(tmp_path / "out.avi")
+    with patch("asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_exec:
+        mock_exec.side_effect = fake_exec
+        with collect_details() as details:
+            await VideoConverter().convert("/tmp/in.mp4", output_path, ".avi")
+
+    ffmpeg_calls = [call.args for call in mock_exec.call_args_list if call.args[0] == "ffmpeg"]
+    segments = [args for args in ffmpeg_calls if "-ss" in args]
+    assert [args[args.index("-ss") + 1] for args in segments] == ["0.000000", "20.000000", "40.000000"]
+    assert "-t" not in segments[-1]
+    concat = ffmpeg_calls[-1]
+    assert concat[-1] == output_path and "copy" in concat
+    assert len(concat_lists) == 1 and concat_lists[0].count("file '") == 3
+    assert details == {"strategy": "transcode", "segments": "3"}
+    # Segment files are removed
+    assert os.listdir(tmp_path) == []
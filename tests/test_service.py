@@ -30,3 +30,68 @@ def test_case_insensitivity():
     
     converter = service.get_converter("TEST.JSON")
     assert converter is not None
+
+@pytest.mark.asyncio
+async def test_identical_conversions_are_merged(tmp_path, mocker):
+    """Concurrent conversions of the same content run the plugin once."""
+    import asyncio
+
+    service = ConverterService()
+    converter = service.get_converter("a.json")
+
+    async def slow_convert(input_path, output_path, target_format, **kwargs):
+        await asyncio.sleep(0.05)
+        with open(output_path, "w") as f:
+            f.write("converted")
+        return output_path
+
+    mock_convert = mocker.patch.object(converter, "convert", side_effect=slow_convert)
+
+    inputs = []
+    for name in ("a.json", "b.json"):
+        path = tmp_path / name
+        path.write_text("{}")
+        inputs.append(str(path))
+
+    results = await asyncio.gather(*[
+        service.execute_conversion(path, str(tmp_path), ".md", content_hash="same")
+        for path in inputs
+    ])
+
+    assert mock_convert.call_count == 1
+    assert sorted(os.path.basename(p) for p in results) == ["a.md", "b.md"]
+    for path in results:
+        with open(path) as f:
+            assert f.read() == "converted"
+
+def test_plugins_load_on_first_use():
+    """Plugin metadata is read without importing plugin modules; instances match it."""
+    from app.services.plugin_registry import PluginRegistry
+
+    registry = PluginRegistry()
+    registry.discover()
+    assert registry.loaded() == []
+
+    for ext, spec in registry.specs().items():
+        assert registry.load(ext).meta == spec.meta
+        assert registry.load(ext).workload == spec.workload
+    assert sorted(registry.loaded()) == sorted(registry.specs())
+
+def test_plugin_metadata_fallback_imports_module():
+    """Modules whose metadata cannot be read statically are scanned after importing them."""
+    from app.services.plugin_registry import scan_plugin_source
+
+    source = "class Dynamic(BaseConverter):\n    meta = property(lambda self: make_meta())\n"
+    assert scan_plugin_source(source, "app.plugins.dynamic") is None
+
+def test_meta_is_frozen_and_normalized():
+    """Plugin metadata is built once, immutable, and uses dotted extensions."""
+    import pydantic
+
+    service = ConverterService()
+    converter = service.get_converter("slides.pptx")
+    assert converter.meta is converter.meta
+    assert converter.meta.supported_targets == (".pdf",)
+    assert converter.meta.supports("PDF") and not converter.meta.supports(".txt")
+    with pytest.raises(pydantic.ValidationError):
+        converter.meta.name = "other"
@@ -0,0 +1,86 @@
+import hashlib
+import io
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.uploads import receive_upload, sniff_type
+
+BOUNDARY = "testboundary"
+
+
+def multipart_body(filename, content, target_format=".md"):
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + content + (
+        f"\r\n--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="target_format"\r\n\r\n'
+        f"{target_format}\r\n"
+        f"--{BOUNDARY}--\r\n"
+    ).encode()
+
+
+def make_request(body, chunk_size):
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+
+    async def receive():
+        chunk = chunks.pop(0)
+        return {"type": "http.request", "body": chunk, "more_body": bool(chunks)}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())],
+    }
+    return Request(scope, receive)
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_across_chunks(tmp_path):
+    """Parts split over many small chunks are reassembled, hashed and written once."""
+    content = b'{"key": "' + b"v" * 5000 + b'"}'
+    request = make_request(multipart_body("data.json", content), chunk_size=7)
+
+    fields, upload = await receive_upload(request, lambda name: str(tmp_path / name), max_bytes=1 << 20)
+
+    assert fields == {"target_format": ".md"}
+    assert upload.filename == "data.json"
+    assert upload.size == len(content)
+    assert upload.content_hash == hashlib.sha256(content).hexdigest()
+    assert (tmp_path / "data.json").read_bytes() == content
+
+
+@pytest.mark.asyncio
+async def test_upload_size_limit_removes_partial_file(tmp_path):
+    request = make_request(multipart_body("big.json", b"x" * 1000), chunk_size=100)
+
+    with pytest.raises(HTTPException) as excinfo:
+        await receive_upload(request, lambda name: str(tmp_path / name), max_bytes=500)
+
+    assert excinfo.value.status_code == 413
+    assert not (tmp_path / "big.json").exists()
+
+
+def test_sniff_type():
+    assert sniff_type(b"%PDF-1.7\n") == "pdf"
+    assert sniff_type(b"\x89PNG\r\n\x1a\n....") == "png"
+    assert sniff_type(b"\x00\x00\x00\x18ftypmp42") == "mp4"
+    assert sniff_type(b'{"a": 1}') is None
+
+
+def test_convert_rejects_mismatched_content(client):
+    """A PNG uploaded under a .pdf name is rejected before conversion."""
+    files = {"file": ("image.pdf", io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32), "application/pdf")}
+    response = client.post("/api/v1/convert", files=files, data={"target_format": ".txt"})
+
+    assert response.status_code == 400
+    assert "does not match" in response.json()["detail"]
+
+
+def test_convert_requires_target_format(client):
+    files = {"file": ("t.json", io.BytesIO(b"{}"), "application/json")}
+    response = client.post("/api/v1/convert", files=files)
+    assert response.status_code == 422
@@ -0,0 +1,51 @@
+import os
+import time
+
+from app.services.workspace_service import WorkspaceManager
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_same_filename_gets_distinct_paths(tmp_path):
+    manager = WorkspaceManager(str(tmp_path))
+    first, second = manager.create(), manager.create()
+
+    assert first.input_path("report.docx") != second.input_path("report.docx")
+    assert first.output_dir != second.output_dir
+    # Client-supplied directories are stripped
+    assert first.input_path("../../etc/passwd") == os.path.join(first.input_dir, "passwd")
+
+
+def test_sweep_removes_expired_but_not_active(tmp_path):
+    manager = WorkspaceManager(str(tmp_path), ttl=60)
+    active = manager.create()
+    finished = manager.create()
+    manager.release(finished)
+    orphan = tmp_path / "left-by-crash"
+    orphan.mkdir()
+
+    for path in (active.root, finished.root, str(orphan)):
+        age(path, 120)
+
+    assert manager.sweep() == 2
+    assert os.path.exists(active.root)
+    assert not os.path.exists(finished.root)
+    assert not orphan.exists()
+
+
+def test_sweep_enforces_disk_budget_oldest_first(tmp_path):
+    manager = WorkspaceManager(str(tmp_path), ttl=3600, max_bytes=150)
+    workspaces = []
+    for i in range(3):
+        workspace = manager.create()
+        with open(workspace.input_path("data.bin"), "wb") as f:
+            f.write(b"x" * 100)
+        manager.release(workspace)
+        age(workspace.root, 100 - i)
+        workspaces.append(workspace)
+
+    assert manager.sweep() == 2
+    assert [os.path.exists(w.root) for w in workspaces] == [False, False, True]